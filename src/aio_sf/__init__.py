@@ -38,6 +38,9 @@ try:
         ParquetWriter,
         create_schema_from_metadata,
         write_query_to_parquet,
+        write_query_to_parquet_files,
+        export_sobject_to_parquet,
+        export_sobjects_to_parquet,
         salesforce_to_arrow_type,
     )
 
@@ -52,6 +55,9 @@ try:
             "ParquetWriter",
             "create_schema_from_metadata",
             "write_query_to_parquet",
+            "write_query_to_parquet_files",
+            "export_sobject_to_parquet",
+            "export_sobjects_to_parquet",
             "salesforce_to_arrow_type",
         ]
     )
@@ -0,0 +1,27 @@
+"""
+JSON decoding for API responses.
+
+Uses orjson when it is installed, which decodes large payloads (query pages,
+describes) several times faster than the standard library.
+"""
+
+from typing import Any
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def response_json(response: httpx.Response) -> Any:
+    """
+    Decode the JSON body of a response.
+
+    :param response: HTTP response with a JSON body
+    :returns: Decoded JSON data
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
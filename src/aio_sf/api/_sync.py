@@ -0,0 +1,52 @@
+"""
+Helpers for consuming async iterators from synchronous code.
+"""
+
+import asyncio
+from typing import AsyncIterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def ensure_no_running_loop(name: str) -> None:
+    """
+    Raise if called from inside a running event loop.
+
+    :param name: Name of the object being iterated, used in the error message
+    :raises RuntimeError: If an event loop is already running in this thread
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise RuntimeError(
+        f"Cannot iterate {name} synchronously when an async event loop is already running. "
+        f"Use 'async for record in query_result' instead."
+    )
+
+
+def iterate_in_new_loop(async_iterable: AsyncIterable[T]) -> Iterator[T]:
+    """
+    Lazily iterate an async iterable from synchronous code.
+
+    Each item is pulled by running the async iterator one step on a private event
+    loop, so only the items currently buffered by the iterator (e.g. one page of
+    results) are held in memory, rather than collecting everything up front.
+
+    :param async_iterable: Async iterable to consume
+    :yields: Items from the async iterable
+    """
+    loop = asyncio.new_event_loop()
+    iterator = async_iterable.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            loop.run_until_complete(aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
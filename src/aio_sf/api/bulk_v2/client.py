@@ -7,6 +7,8 @@ import logging
 import time
 from typing import Optional, Tuple, TYPE_CHECKING
 
+import httpx
+
 from .types import (
     BulkJobCreateRequest,
     BulkJobInfo,
@@ -93,6 +95,29 @@ class BulkV2API:
         response.raise_for_status()
         return response.json()
 
+    async def _request_job_results(
+        self,
+        job_id: str,
+        locator: Optional[str],
+        max_records: int,
+        api_version: Optional[str],
+    ) -> Tuple[httpx.Response, Optional[str]]:
+        """Request one page of job results and return it with the next locator."""
+        results_url = self._get_job_results_url(job_id, api_version)
+        params = {"maxRecords": max_records}
+        if locator:
+            params["locator"] = locator
+
+        response = await self.client.get(results_url, params=params)
+        response.raise_for_status()
+
+        # Get next locator from headers
+        next_locator = response.headers.get("Sforce-Locator")
+        if next_locator == "null":
+            next_locator = None
+
+        return response, next_locator
+
     async def get_job_results(
         self,
         job_id: str,
@@ -109,20 +134,34 @@ class BulkV2API:
         :param api_version: API version to use (defaults to client version)
         :returns: Tuple of (CSV response text, next locator or None)
         """
-        results_url = self._get_job_results_url(job_id, api_version)
-        params = {"maxRecords": max_records}
-        if locator:
-            params["locator"] = locator
+        response, next_locator = await self._request_job_results(
+            job_id, locator, max_records, api_version
+        )
+        return response.text, next_locator
 
-        response = await self.client.get(results_url, params=params)
-        response.raise_for_status()
+    async def get_job_results_bytes(
+        self,
+        job_id: str,
+        locator: Optional[str] = None,
+        max_records: int = 10000,
+        api_version: Optional[str] = None,
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Get results from a completed bulk job as undecoded UTF-8 CSV bytes.
 
-        # Get next locator from headers
-        next_locator = response.headers.get("Sforce-Locator")
-        if next_locator == "null":
-            next_locator = None
+        Use this when the CSV is handed to a parser that reads bytes (e.g.
+        pyarrow.csv), to skip decoding the page to str and encoding it again.
 
-        return response.text, next_locator
+        :param job_id: The job ID
+        :param locator: Query locator for pagination (optional)
+        :param max_records: Maximum number of records to fetch
+        :param api_version: API version to use (defaults to client version)
+        :returns: Tuple of (CSV response bytes, next locator or None)
+        """
+        response, next_locator = await self._request_job_results(
+            job_id, locator, max_records, api_version
+        )
+        return response.content, next_locator
 
     async def wait_for_job_completion(
         self,
@@ -110,11 +110,7 @@ def prepare_records(
         return records  # type: ignore
 
     # Add attributes to records that don't have them
-    prepared_records = []
-    for record in records:
-        prepared_record = {"attributes": {"type": sobject_type}, **record}
-        prepared_records.append(prepared_record)
-    return prepared_records
+    return [{"attributes": {"type": sobject_type}, **record} for record in records]
 
 
 def validate_records_have_field(
@@ -2,9 +2,11 @@
 Salesforce Describe API methods.
 """
 
+import copy
 import logging
-from typing import List, Optional, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
+from .._json import response_json
 from .types import (
     OrganizationInfo,
     OrganizationLimits,
@@ -23,21 +25,41 @@ class DescribeAPI:
 
     def __init__(self, client: "SalesforceClient"):
         self.client = client
+        self._sobject_cache: Dict[Tuple[str, str], SObjectDescribe] = {}
 
     async def sobject(
-        self, sobject_type: str, api_version: Optional[str] = None
+        self,
+        sobject_type: str,
+        api_version: Optional[str] = None,
+        use_cache: bool = False,
     ) -> SObjectDescribe:
         """
         Get metadata for a Salesforce object.
 
         :param sobject_type: Name of the Salesforce object (e.g., 'Account', 'Contact')
         :param api_version: API version to use (defaults to client version)
+        :param use_cache: Reuse a describe previously cached through this client,
+            fetching and caching it if needed (describes are large and rarely
+            change within a session). Cached describes are returned as copies, so
+            callers may modify them.
         :returns: Object metadata dictionary
         """
+        cache_key = (sobject_type.lower(), api_version or self.client.version)
+        if use_cache and cache_key in self._sobject_cache:
+            return copy.deepcopy(self._sobject_cache[cache_key])
+
         url = self.client.get_describe_url(sobject_type, api_version)
         response = await self.client.get(url)
         response.raise_for_status()
-        return response.json()
+        describe: SObjectDescribe = response_json(response)
+        if not use_cache:
+            return describe
+        self._sobject_cache[cache_key] = describe
+        return copy.deepcopy(describe)
+
+    def clear_cache(self) -> None:
+        """Forget all cached SObject describes."""
+        self._sobject_cache.clear()
 
     async def list_sobjects(
         self, api_version: Optional[str] = None
@@ -52,7 +74,7 @@ class DescribeAPI:
         url = f"{base_url}/sobjects"
         response = await self.client.get(url)
         response.raise_for_status()
-        data = response.json()
+        data = response_json(response)
         return data.get("sobjects", [])
 
     async def get_limits(self, api_version: Optional[str] = None) -> OrganizationLimits:
@@ -66,7 +88,7 @@ class DescribeAPI:
         url = f"{base_url}/limits"
         response = await self.client.get(url)
         response.raise_for_status()
-        return response.json()
+        return response_json(response)
 
     async def get_organization_info(
         self, api_version: Optional[str] = None
@@ -85,7 +107,7 @@ class DescribeAPI:
         }
         response = await self.client.get(url, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = response_json(response)
 
         records = data.get("records", [])
         if records:
@@ -1,6 +1,5 @@
 """Salesforce Query API client."""
 
-import asyncio
 from typing import Any, Dict, List, Optional, AsyncGenerator
 
 from typing import TYPE_CHECKING
@@ -8,6 +7,8 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ..client import SalesforceClient
 
+from .._json import response_json
+from .._sync import ensure_no_running_loop, iterate_in_new_loop
 from .types import QueryResponse, QueryMoreResponse
 
 
@@ -50,28 +51,9 @@ class QueryResult:
         return self._done and self._current_index >= len(self._records)
 
     def __iter__(self):
-        """Synchronous iterator - collects all records in memory."""
-        # For backward compatibility, we'll collect all records in a blocking manner
-        # This is not ideal for large datasets, but maintains the existing API
-        try:
-            loop = asyncio.get_running_loop()
-            # If we're in an async context, we can't block
-            raise RuntimeError(
-                "Cannot iterate QueryResult synchronously when an async event loop is already running. "
-                "Use 'async for record in query_result' instead."
-            )
-        except RuntimeError as e:
-            if "Cannot iterate" in str(e):
-                raise e
-            # No event loop is running, we can create one
-            return asyncio.run(self._collect_all_records())
-
-    async def _collect_all_records(self):
-        """Collect all records into a list for synchronous iteration."""
-        records = []
-        async for record in self:
-            records.append(record)
-        return iter(records)
+        """Synchronous iterator - streams records one page at a time."""
+        ensure_no_running_loop("QueryResult")
+        return iterate_in_new_loop(self)
 
     async def __aiter__(self):
         """Async iterator that yields individual records."""
@@ -81,24 +63,34 @@ class QueryResult:
             yield record
 
         # Then handle pagination if needed
+        async for page in self._iter_more_pages():
+            for record in page:
+                yield record
+
+    async def _iter_more_pages(self) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield the records of each page after the initial response."""
         next_url = self._next_records_url
         while next_url and not self._done:
             # Make QueryMore request
             more_response = await self._query_api.query_more(next_url)
 
-            # Yield records from this batch
-            for record in more_response["records"]:
-                yield record
+            yield more_response["records"]
 
             # Update pagination state
             self._done = more_response["done"]
             next_url = more_response.get("nextRecordsUrl")
 
     async def collect_all(self) -> List[Dict[str, Any]]:
-        """Collect all records into a list."""
-        records = []
-        async for record in self:
-            records.append(record)
+        """
+        Collect all records into a list.
+
+        Whole pages are added with a single ``extend`` rather than appending
+        record by record through the async iterator.
+        """
+        records = self._records[self._current_index :]
+        self._current_index = len(self._records)
+        async for page in self._iter_more_pages():
+            records.extend(page)
         return records
 
 
@@ -166,7 +158,7 @@ class QueryAPI:
         response.raise_for_status()
 
         # Return QueryResult for iteration
-        return QueryResult(self, response.json())
+        return QueryResult(self, response_json(response))
 
     async def query_more(self, next_records_url: str) -> QueryMoreResponse:
         """
@@ -184,7 +176,7 @@ class QueryAPI:
         # Make the request
         response = await self._client.get(url)
         response.raise_for_status()
-        return response.json()
+        return response_json(response)
 
     async def explain(
         self,
@@ -208,7 +200,7 @@ class QueryAPI:
         # Make the request
         response = await self._client.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        return response_json(response)
 
     async def sosl(
         self,
@@ -234,5 +226,5 @@ class QueryAPI:
         # Make the request
         response = await self._client.get(url, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = response_json(response)
         return data.get("searchRecords", [])
@@ -2,7 +2,7 @@
 Exporter module for aio-salesforce.
 
 This module contains utilities for exporting Salesforce data to various formats.
-The entire module requires optional dependencies (pandas, pyarrow).
+The entire module requires optional dependencies (pyarrow, boto3).
 """
 
 from .bulk_export import (
@@ -15,14 +15,26 @@ from .bulk_export import (
 )
 from .parquet_writer import (
     ParquetWriter,
+    SObjectExportResult,
     create_schema_from_metadata,
     write_query_to_parquet,
+    write_query_to_parquet_files,
+    export_sobject_to_parquet,
+    export_sobjects_to_parquet,
     salesforce_to_arrow_type,
 )
 from .arrow import (
     records_to_arrow_batch,
     query_result_to_batches,
 )
+from .s3 import (
+    S3MultipartSink,
+    create_s3_client,
+    create_transfer_config,
+    get_bucket_region,
+    upload_file_to_s3,
+    write_query_to_s3,
+)
 
 __all__ = [
     "bulk_query",
@@ -34,7 +46,17 @@ __all__ = [
     "ParquetWriter",
     "create_schema_from_metadata",
     "write_query_to_parquet",
+    "write_query_to_parquet_files",
+    "SObjectExportResult",
+    "export_sobject_to_parquet",
+    "export_sobjects_to_parquet",
     "salesforce_to_arrow_type",
     "records_to_arrow_batch",
     "query_result_to_batches",
+    "create_s3_client",
+    "create_transfer_config",
+    "get_bucket_region",
+    "upload_file_to_s3",
+    "S3MultipartSink",
+    "write_query_to_s3",
 ]
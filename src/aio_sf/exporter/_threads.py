@@ -0,0 +1,32 @@
+"""
+Helpers for running blocking exporter work in worker threads.
+"""
+
+import asyncio
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+async def run_in_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking function in a worker thread, like ``asyncio.to_thread``.
+
+    A running thread cannot be interrupted, so ``asyncio.to_thread`` returns on
+    cancellation while the function carries on in the background. Cleanup code
+    (closing a writer, aborting an upload) would then race with it on the same
+    objects. Here cancellation instead waits for the function to finish before
+    it propagates.
+
+    :param func: Blocking function to run
+    :returns: The function's return value
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait([task])
+        if not task.cancelled():
+            # Retrieve the outcome so it isn't logged as never retrieved
+            task.exception()
+        raise
@@ -6,15 +6,42 @@ QueryResult data as PyArrow RecordBatches. ParquetWriter imports from here so al
 type-conversion logic lives in one place.
 """
 
+import asyncio
+import csv
+import io
 import logging
-from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+from itertools import chain
+from operator import itemgetter
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
 
-import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 
 from ..api.describe.types import FieldInfo
 from .bulk_export import QueryResult, batch_records_async
 
+# A column is either a list of raw Python values or an already-built Arrow array
+ColumnValues = Union[List[Any], pa.Array]
+
+# What the streaming writers read: a bulk QueryResult, or any async iterable of
+# record dicts (e.g. the REST API's QueryResult)
+RecordSource = Union[QueryResult, AsyncIterable[Dict[str, Any]]]
+
+# One unit of work for the writers: a Bulk API CSV results page, or a batch of
+# record dicts from a source that has no CSV pages
+ResultPage = Union[bytes, List[Dict[str, Any]]]
+
 
 # ---------------------------------------------------------------------------
 # Type mapping
@@ -44,6 +71,10 @@ def _default_type_mapping() -> Dict[str, pa.DataType]:
     }
 
 
+# Built once: salesforce_to_arrow_type runs for every field of every schema
+_DEFAULT_TYPE_MAPPING = _default_type_mapping()
+
+
 def salesforce_to_arrow_type(
     sf_type: str,
     type_mapping_overrides: Optional[Dict[str, pa.DataType]] = None,
@@ -54,31 +85,67 @@ def salesforce_to_arrow_type(
     :param type_mapping_overrides: Optional overrides for specific type mappings
     :returns: Corresponding PyArrow DataType
     """
-    mapping = _default_type_mapping()
-    if type_mapping_overrides:
-        mapping = {**mapping, **type_mapping_overrides}
-    return mapping.get(sf_type.lower(), pa.string())
+    key = sf_type.lower()
+    if type_mapping_overrides and key in type_mapping_overrides:
+        return type_mapping_overrides[key]
+    return _DEFAULT_TYPE_MAPPING.get(key, pa.string())
+
+
+def _narrow_numeric_type(field: FieldInfo) -> Optional[pa.DataType]:
+    """Smallest integer type that holds every value of a whole-number field.
+
+    Salesforce reports ``digits`` for int fields and ``precision``/``scale`` for
+    double, currency and percent fields. Returns None for fields that can hold
+    fractions or whose size is unknown.
+    """
+    sf_type = field.get("type", "")
+    if sf_type == "int":
+        digits = field.get("digits") or 0
+    elif sf_type in ("double", "currency", "percent") and field.get("scale") == 0:
+        digits = field.get("precision") or 0
+    else:
+        return None
+
+    # 9 digits always fit in int32 (max 2,147,483,647), 18 in int64
+    if 0 < digits <= 9:
+        return pa.int32()
+    if 0 < digits <= 18:
+        return pa.int64()
+    return None
 
 
 def create_schema_from_metadata(
     fields_metadata: List[FieldInfo],
     column_formatter: Optional[Callable[[str], str]] = None,
     type_mapping_overrides: Optional[Dict[str, pa.DataType]] = None,
+    narrow_numeric_types: bool = False,
 ) -> pa.Schema:
     """Create a PyArrow schema from Salesforce field metadata.
 
+    With ``narrow_numeric_types``, whole-number fields (int fields, and double,
+    currency or percent fields with scale 0) are mapped to int32 or int64 based
+    on their declared digits/precision instead of int64/float64, which halves
+    the size of most such columns. Types listed in ``type_mapping_overrides``
+    are never narrowed.
+
     :param fields_metadata: List of FieldInfo dicts from a Salesforce describe call
     :param column_formatter: Optional function to transform column names
     :param type_mapping_overrides: Optional overrides for Salesforce→Arrow type mapping
+    :param narrow_numeric_types: Map whole-number fields to the smallest integer type
     :returns: PyArrow Schema
     """
+    overridden = {t.lower() for t in type_mapping_overrides or {}}
     arrow_fields = []
     for field in fields_metadata:
         field_name = field.get("name", "")
         if column_formatter:
             field_name = column_formatter(field_name)
         sf_type = field.get("type", "string")
-        arrow_type = salesforce_to_arrow_type(sf_type, type_mapping_overrides)
+        arrow_type = None
+        if narrow_numeric_types and sf_type.lower() not in overridden:
+            arrow_type = _narrow_numeric_type(field)
+        if arrow_type is None:
+            arrow_type = salesforce_to_arrow_type(sf_type, type_mapping_overrides)
         arrow_fields.append(pa.field(field_name, arrow_type, nullable=True))
     return pa.schema(arrow_fields)
 
@@ -87,17 +154,25 @@ def create_schema_from_metadata(
 # Schema helpers
 # ---------------------------------------------------------------------------
 
-def infer_schema_from_dataframe(df: pd.DataFrame) -> pa.Schema:
-    """Infer an Arrow schema from a pandas DataFrame's dtypes."""
+def infer_schema_from_columns(columns: Dict[str, ColumnValues]) -> pa.Schema:
+    """Infer an Arrow schema from column lists built by ``records_to_columns``.
+
+    Booleans, integers and floats keep their inferred type; everything else
+    (including the all-string columns produced by Bulk API CSV) becomes string.
+    """
     fields = []
-    for col_name, dtype in df.dtypes.items():
-        if dtype == "object":
-            arrow_type = pa.string()
-        elif dtype == "bool":
+    for col_name, values in columns.items():
+        try:
+            inferred = (
+                values.type if isinstance(values, pa.Array) else pa.array(values).type
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            inferred = pa.string()
+        if pa.types.is_boolean(inferred):
             arrow_type = pa.bool_()
-        elif dtype in ["int64", "int32"]:
+        elif pa.types.is_integer(inferred):
             arrow_type = pa.int64()
-        elif dtype in ["float64", "float32"]:
+        elif pa.types.is_floating(inferred):
             arrow_type = pa.float64()
         else:
             arrow_type = pa.string()
@@ -121,63 +196,202 @@ def filter_schema_to_data(schema: pa.Schema, data_columns: List[str]) -> pa.Sche
 # Type conversion helpers
 # ---------------------------------------------------------------------------
 
-def _convert_datetime_strings(series: pd.Series) -> pd.Series:
-    """Parse Salesforce ISO datetime strings (e.g. '2023-12-25T10:30:00.000+0000')
-    into a UTC-aware pandas datetime Series suitable for Arrow timestamp columns.
-
-    Uses vectorized pandas operations — avoids per-row Python function calls which
-    are orders of magnitude slower for large batches.
+def records_to_columns(
+    records: List[Dict[str, Any]],
+    column_formatter: Optional[Callable[[str], str]] = None,
+) -> Dict[str, List[Any]]:
+    """Pivot row-oriented record dicts into one list per column.
+
+    Columns appear in first-seen order; records missing a key get ``None`` in
+    that column. The REST API's per-record ``attributes`` metadata is skipped
+    rather than popped from each record, and ``column_formatter`` is called
+    once per distinct key instead of once per value.
+
+    Records of one query share the same fields, so the common case pulls every
+    value of a record with a single ``itemgetter`` call (one C-level call per
+    record rather than one ``.get`` per field) and transposes the rows with
+    ``zip``. Batches where some record lacks a key fall back to ``.get``.
+
+    :param records: List of record dicts from Salesforce
+    :param column_formatter: Optional function applied to each column name
+    :returns: Dict mapping (formatted) column name to a list of values
     """
-    s = series.replace({"": None})
-    # Normalise the two offset formats Salesforce uses to the standard +HH:MM form
-    # so pandas can parse them in a single vectorised pass.
-    s = s.str.replace(r"\+0000$", "+00:00", regex=True)
-    s = s.str.replace(r"Z$", "+00:00", regex=True)
-    return pd.to_datetime(s, utc=True, errors="coerce")
+    keys = dict.fromkeys(chain.from_iterable(records))
+    keys.pop("attributes", None)
+    names = [column_formatter(key) if column_formatter else key for key in keys]
 
+    if len(keys) > 1:
+        try:
+            rows = map(itemgetter(*keys), records)
+            return {name: list(values) for name, values in zip(names, zip(*rows))}
+        except KeyError:
+            pass
 
-def _convert_date_strings(series: pd.Series) -> pd.Series:
-    """Parse Salesforce ISO date strings (e.g. '2025-10-01') into a pandas
-    datetime64 Series; PyArrow will cast that to date32."""
-    series = series.replace({"": None})
-    return pd.to_datetime(series, format="%Y-%m-%d", errors="coerce")
+    return {
+        name: [record.get(key) for record in records] for name, key in zip(names, keys)
+    }
 
 
-def convert_dataframe_types(
-    df: pd.DataFrame,
-    schema: pa.Schema,
-    convert_empty_to_null: bool = True,
-) -> None:
-    """Apply Salesforce-to-Arrow type conversions to a DataFrame in place.
+def _cast_values_individually(
+    array: pa.Array, arrow_type: pa.DataType, column_name: Optional[str] = None
+) -> pa.Array:
+    """Cast value by value, turning anything unparseable into null.
 
-    Handles boolean, integer, float, timestamp, date, and string fields.
-    Unknown types are left untouched.
+    Only used as a fallback when the vectorised cast rejects the column, so
+    malformed values degrade to null instead of failing the whole batch. Integer
+    columns retry each value through float64 (so "5.0" still becomes 5), and
+    the number of nulled values is logged so the loss is never silent.
     """
-    for field in schema:
-        col = field.name
-        if col not in df.columns:
+    retry_as_float = pa.types.is_integer(arrow_type) and pa.types.is_string(array.type)
+    values = []
+    rejected = []
+    for scalar in array:
+        try:
+            values.append(scalar.cast(arrow_type).as_py())
             continue
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+        value = None
+        if retry_as_float:
+            try:
+                value = scalar.cast(pa.float64()).cast(arrow_type).as_py()
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass
+        if value is None:
+            rejected.append(scalar.as_py())
+        values.append(value)
+
+    if rejected:
+        logging.warning(
+            f"Column {column_name or '?'}: {len(rejected)} value(s) could not be "
+            f"converted to {arrow_type} and were set to null (e.g. {rejected[0]!r})"
+        )
+    return pa.array(values, type=arrow_type)
 
-        if convert_empty_to_null:
-            df[col] = df[col].replace({"": None})
 
-        if pa.types.is_boolean(field.type):
-            df[col] = df[col].map(
-                {"true": True, "false": False, "True": True, "False": False}
+def read_csv_page(
+    csv_data: Union[str, bytes],
+    column_formatter: Optional[Callable[[str], str]] = None,
+) -> Dict[str, pa.Array]:
+    """Parse one Bulk API CSV results page into string columns.
+
+    The page is parsed by Arrow's native CSV reader, so no per-record Python
+    objects are created. Every column is read as string, with empty values
+    kept as empty strings to match the record-based path; typing happens
+    afterwards in ``columns_to_arrow_batch``. Pass the raw UTF-8 bytes (as
+    yielded by ``QueryResult.iter_csv_pages``) to avoid an encoding copy.
+
+    :param csv_data: CSV bytes or text of a results page, including the header row
+    :param column_formatter: Optional function applied to each column name
+    :returns: Dict mapping (formatted) column name to a string Array
+    """
+    if isinstance(csv_data, str):
+        csv_data = csv_data.encode("utf-8")
+    if not csv_data or not csv_data.strip():
+        return {}
+
+    header_end = csv_data.find(b"\n")
+    header_line = csv_data[: header_end if header_end >= 0 else len(csv_data)]
+    source_names = next(csv.reader([header_line.decode("utf-8").rstrip("\r")]))
+    names = [column_formatter(n) if column_formatter else n for n in source_names]
+
+    table = pa_csv.read_csv(
+        io.BytesIO(csv_data),
+        read_options=pa_csv.ReadOptions(column_names=names, skip_rows=1),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in names},
+            strings_can_be_null=False,
+        ),
+    )
+    return {
+        name: (
+            pa.concat_arrays(column.chunks)
+            if column.num_chunks
+            else pa.array([], pa.string())
+        )
+        for name, column in zip(names, table.columns)
+    }
+
+
+def _column_to_arrow(
+    values: ColumnValues,
+    arrow_type: pa.DataType,
+    convert_empty_to_null: bool = True,
+    column_name: Optional[str] = None,
+) -> pa.Array:
+    """Build an Arrow array of ``arrow_type`` from raw Salesforce values.
+
+    Bulk API values arrive as strings (e.g. ``"true"``, ``"42"``,
+    ``"2023-12-25T10:30:00.000+0000"``), which Arrow's cast kernels parse
+    directly, so no per-row Python conversion happens on the common path.
+    """
+    if isinstance(values, pa.Array):
+        array = values
+    else:
+        try:
+            array = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            array = pa.array(
+                [None if v is None else str(v) for v in values], type=pa.string()
             )
-        elif pa.types.is_integer(field.type):
-            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
-        elif pa.types.is_floating(field.type):
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-        elif pa.types.is_timestamp(field.type):
-            df[col] = _convert_datetime_strings(df[col])
-        elif pa.types.is_date(field.type):
-            df[col] = _convert_date_strings(df[col])
-        elif pa.types.is_string(field.type):
-            df[col] = df[col].apply(lambda x: None if pd.isna(x) else str(x))
 
-        if not pa.types.is_string(field.type):
-            df[col] = df[col].replace("", pd.NA)
+    if pa.types.is_null(array.type):
+        return pa.nulls(len(array), type=arrow_type)
+
+    # Empty strings are never valid for non-string types, so always null them there
+    if pa.types.is_string(array.type) and (
+        convert_empty_to_null or not pa.types.is_string(arrow_type)
+    ):
+        array = pc.if_else(pc.equal(array, ""), pa.scalar(None, pa.string()), array)
+
+    if array.type == arrow_type:
+        return array
+    try:
+        return array.cast(arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        pass
+    if pa.types.is_string(arrow_type) and not isinstance(values, pa.Array):
+        # Nested values (e.g. parent relationship dicts from the REST API) have no
+        # string cast, so keep their Python text form instead of nulling them
+        return _column_to_arrow(
+            [None if v is None else str(v) for v in values],
+            arrow_type,
+            convert_empty_to_null,
+            column_name,
+        )
+    if pa.types.is_integer(arrow_type) and pa.types.is_string(array.type):
+        # Whole numbers may be rendered with a decimal point (e.g. "5.0"); the
+        # safe float -> int cast still rejects values with a fractional part
+        try:
+            return array.cast(pa.float64()).cast(arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+    return _cast_values_individually(array, arrow_type, column_name)
+
+
+def columns_to_arrow_batch(
+    columns: Dict[str, ColumnValues],
+    schema: pa.Schema,
+    convert_empty_to_null: bool = True,
+) -> pa.RecordBatch:
+    """Convert column lists into a RecordBatch matching ``schema``.
+
+    Schema fields with no matching column are filled with nulls.
+    """
+    num_rows = len(next(iter(columns.values()))) if columns else 0
+    arrays = []
+    for field in schema:
+        values = columns.get(field.name)
+        if values is None:
+            arrays.append(pa.nulls(num_rows, type=field.type))
+        else:
+            arrays.append(
+                _column_to_arrow(
+                    values, field.type, convert_empty_to_null, column_name=field.name
+                )
+            )
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
 
 
 # ---------------------------------------------------------------------------
@@ -200,19 +414,46 @@ def records_to_arrow_batch(
     :param convert_empty_to_null: Convert empty strings to null values
     :returns: PyArrow RecordBatch
     """
-    converted = [{k.lower(): v for k, v in r.items()} for r in records]
-    df = pd.DataFrame(converted)
-    convert_dataframe_types(df, schema, convert_empty_to_null)
-    table = pa.Table.from_pandas(df, schema=schema)
-    if table.num_rows > 0:
-        return table.to_batches()[0]
-    return pa.RecordBatch.from_pydict(
-        {f.name: [] for f in schema}, schema=schema
-    )
+    columns = records_to_columns(records, column_formatter=str.lower)
+    return columns_to_arrow_batch(columns, schema, convert_empty_to_null)
+
+
+def iter_result_pages(
+    query_result: RecordSource, batch_size: int = 10000
+) -> AsyncIterator[ResultPage]:
+    """Iterate a record source page by page.
+
+    Bulk QueryResults yield their raw CSV pages, which are parsed column-wise.
+    Any other async record iterator is grouped into lists of ``batch_size``
+    record dicts instead.
+
+    :param query_result: Bulk QueryResult or async iterable of record dicts
+    :param batch_size: Records per page for sources without CSV pages
+    :returns: Async iterator of pages
+    """
+    iter_csv_pages = getattr(query_result, "iter_csv_pages", None)
+    if iter_csv_pages is not None:
+        pages: AsyncIterator[ResultPage] = iter_csv_pages()
+        return pages
+    return batch_records_async(query_result, batch_size)
+
+
+def page_to_columns(
+    page: ResultPage, column_formatter: Optional[Callable[[str], str]] = None
+) -> Dict[str, ColumnValues]:
+    """Pivot a page from iter_result_pages into one column per field.
+
+    :param page: CSV bytes or a list of record dicts
+    :param column_formatter: Optional function applied to each column name
+    :returns: Dict mapping (formatted) column name to its values
+    """
+    if isinstance(page, (bytes, str)):
+        return read_csv_page(page, column_formatter)
+    return dict(records_to_columns(page, column_formatter))
 
 
 async def query_result_to_batches(
-    query_result: QueryResult,
+    query_result: RecordSource,
     fields_metadata: Optional[List[FieldInfo]] = None,
     schema: Optional[pa.Schema] = None,
     batch_size: int = 10000,
@@ -226,10 +467,16 @@ async def query_result_to_batches(
     ``schema`` nor ``fields_metadata`` is provided the schema is inferred from
     the first batch.
 
-    :param query_result: QueryResult from a bulk_query call
+    Each Bulk API results page is parsed by Arrow's CSV reader and sliced into
+    batches of at most ``batch_size`` rows; batches never span two pages. Other
+    async record iterators (e.g. a REST query result) are pivoted
+    ``batch_size`` records at a time.
+
+    :param query_result: QueryResult from a bulk_query call, or any async
+        iterable of record dicts
     :param fields_metadata: Salesforce field metadata for schema creation
     :param schema: Pre-created PyArrow schema (takes precedence over fields_metadata)
-    :param batch_size: Number of records per batch
+    :param batch_size: Maximum number of records per batch
     :param convert_empty_to_null: Convert empty strings to null values
     :yields: PyArrow RecordBatch objects
     """
@@ -241,21 +488,28 @@ async def query_result_to_batches(
 
     schema_finalized = False
 
-    async for records in batch_records_async(query_result, batch_size):
-        converted = [{k.lower(): v for k, v in r.items()} for r in records]
-        df = pd.DataFrame(converted)
+    def page_to_batch(page: ResultPage) -> Optional[pa.RecordBatch]:
+        nonlocal effective_schema, schema_finalized
+        columns = page_to_columns(page, str.lower)
+        if not columns:
+            return None
 
         if not schema_finalized:
             if effective_schema is None:
-                effective_schema = infer_schema_from_dataframe(df)
+                effective_schema = infer_schema_from_columns(columns)
             else:
                 effective_schema = filter_schema_to_data(
-                    effective_schema, df.columns.tolist()
+                    effective_schema, list(columns)
                 )
             schema_finalized = True
 
-        convert_dataframe_types(df, effective_schema, convert_empty_to_null)
-        table = pa.Table.from_pandas(df, schema=effective_schema)
+        return columns_to_arrow_batch(columns, effective_schema, convert_empty_to_null)
+
+    async for page in iter_result_pages(query_result, batch_size):
+        # Parse and convert off the event loop so the next page keeps downloading
+        page_batch = await asyncio.to_thread(page_to_batch, page)
+        if page_batch is None:
+            continue
 
-        for batch in table.to_batches():
-            yield batch
+        for offset in range(0, page_batch.num_rows, batch_size):
+            yield page_batch.slice(offset, batch_size)
@@ -1,5 +1,14 @@
 import logging
-from typing import Any, Dict, List, Generator, Optional
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Dict,
+    List,
+    Generator,
+    Optional,
+    Tuple,
+)
 import csv
 import asyncio
 import io
@@ -8,6 +17,7 @@ import httpx
 
 from ..api.describe.types import FieldInfo
 from ..api.client import SalesforceClient
+from ..api._sync import ensure_no_running_loop, iterate_in_new_loop
 
 
 class QueryResult:
@@ -49,33 +59,14 @@ class QueryResult:
         self._retry_base_delay = retry_base_delay
 
     def __iter__(self):
-        """Synchronous iterator - collects all records in memory."""
-        # For backward compatibility, we'll collect all records in a blocking manner
-        # This is not ideal for large datasets, but maintains the existing API
-        try:
-            loop = asyncio.get_running_loop()
-            # If we're in an async context, we can't block
-            raise RuntimeError(
-                "Cannot iterate QueryResult synchronously when an async event loop is already running. "
-                "Use 'async for record in query_result' instead."
-            )
-        except RuntimeError as e:
-            if "Cannot iterate" in str(e):
-                raise e
-            # No event loop is running, we can create one
-            return asyncio.run(self._collect_all_records())
+        """Synchronous iterator - streams records one page at a time."""
+        ensure_no_running_loop("QueryResult")
+        return iterate_in_new_loop(self)
 
     def __aiter__(self):
         """Async iterator protocol - enables 'async for record in query_result'."""
         return self._generate_records()
 
-    async def _collect_all_records(self):
-        """Collect all records into a list for synchronous iteration."""
-        records = []
-        async for record in self._generate_records():
-            records.append(record)
-        return iter(records)
-
     def __len__(self) -> int:
         """Return the total number of records."""
         if self._total_records is None:
@@ -166,6 +157,78 @@ class QueryResult:
             logging.error(f"Unexpected error parsing CSV response: {e}")
             return
 
+    async def _fetch_page(
+        self, locator: Optional[str], as_bytes: bool = False
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Fetch one page of job results, retrying transient network errors.
+
+        :param locator: Locator of the page to fetch (None for the first page)
+        :param as_bytes: Return the undecoded response bytes instead of text
+        :returns: Tuple of (CSV response text or bytes, next locator or None)
+        """
+        get_results = (
+            self._sf.bulk_v2.get_job_results_bytes
+            if as_bytes
+            else self._sf.bulk_v2.get_job_results
+        )
+        for attempt in range(self._max_retries):
+            try:
+                return await get_results(
+                    job_id=self._job_id,
+                    locator=locator,
+                    max_records=self._batch_size,
+                    api_version=self._api_version,
+                )
+            except (httpx.TimeoutException, httpx.ConnectError) as e:
+                if attempt < self._max_retries - 1:
+                    delay = self._retry_base_delay * (2 ** attempt)
+                    logging.warning(
+                        f"Transient error fetching results at locator {locator} "
+                        f"(attempt {attempt + 1}/{self._max_retries}): {e}. "
+                        f"Retrying in {delay}s..."
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    raise
+        return (b"" if as_bytes else ""), None
+
+    async def iter_csv_pages(self) -> AsyncGenerator[bytes, None]:
+        """
+        Async generator that yields the raw CSV bytes of each results page.
+
+        Each page includes its own header row, so it can be handed directly to a
+        columnar CSV parser without going through per-record dictionaries. Pages
+        are the undecoded UTF-8 response body, which pyarrow.csv reads as is.
+
+        The next page is requested before the current one is yielded, so its
+        download overlaps with whatever the consumer does with the current page
+        (as long as the consumer yields to the event loop, e.g. by offloading
+        CPU work with ``asyncio.to_thread``). At most two pages are held at once.
+
+        :yields: UTF-8 CSV bytes for each page of results
+        """
+        next_page: Optional[asyncio.Future[Tuple[Any, Optional[str]]]] = (
+            asyncio.ensure_future(self._fetch_page(self._query_locator, as_bytes=True))
+        )
+        try:
+            while next_page is not None:
+                response_content, next_locator = await next_page
+                next_page = (
+                    asyncio.ensure_future(self._fetch_page(next_locator, as_bytes=True))
+                    if next_locator
+                    else None
+                )
+                yield response_content
+        finally:
+            if next_page is not None:
+                # Wait for the abandoned prefetch and retrieve its outcome, so a
+                # failed download doesn't log "Task exception was never retrieved"
+                next_page.cancel()
+                await asyncio.wait([next_page])
+                if not next_page.cancelled():
+                    next_page.exception()
+
     async def _generate_records(self):
         """Async generator that yields individual records."""
         locator = self._query_locator
@@ -173,28 +236,7 @@ class QueryResult:
 
         try:
             while True:
-                response_text: str = ""
-                next_locator: Optional[str] = None
-                for attempt in range(self._max_retries):
-                    try:
-                        response_text, next_locator = await self._sf.bulk_v2.get_job_results(
-                            job_id=self._job_id,
-                            locator=locator,
-                            max_records=self._batch_size,
-                            api_version=self._api_version,
-                        )
-                        break
-                    except (httpx.TimeoutException, httpx.ConnectError) as e:
-                        if attempt < self._max_retries - 1:
-                            delay = self._retry_base_delay * (2 ** attempt)
-                            logging.warning(
-                                f"Transient error fetching results at record {ctn} "
-                                f"(attempt {attempt + 1}/{self._max_retries}): {e}. "
-                                f"Retrying in {delay}s..."
-                            )
-                            await asyncio.sleep(delay)
-                        else:
-                            raise
+                response_text, next_locator = await self._fetch_page(locator)
 
                 for record in self._stream_csv_to_records(response_text):
                     ctn += 1
@@ -378,15 +420,17 @@ def write_records_to_csv(
             writer.writerow(record)
 
 
-async def batch_records_async(query_result: QueryResult, batch_size: int = 1000):
+async def batch_records_async(
+    query_result: AsyncIterable[Dict[str, Any]], batch_size: int = 1000
+) -> AsyncGenerator[List[Dict[str, Any]], None]:
     """
     Convert individual records into batches for bulk operations (async version).
 
-    :param query_result: QueryResult object yielding individual records
+    :param query_result: QueryResult (or other async iterable) yielding records
     :param batch_size: Number of records per batch
     :yields: Lists of records (batches)
     """
-    batch = []
+    batch: List[Dict[str, Any]] = []
     async for record in query_result:
         batch.append(record)
         if len(batch) >= batch_size:
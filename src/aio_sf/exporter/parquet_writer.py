@@ -2,48 +2,144 @@
 Parquet writer module for converting Salesforce QueryResult to Parquet format.
 """
 
+import asyncio
+import io
 import logging
-from typing import Any, Dict, List, Optional, Callable
+from datetime import datetime, timezone
+from typing import (
+    IO,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Callable,
+    Sequence,
+    TypedDict,
+    Union,
+)
 from pathlib import Path
 import pyarrow as pa
-import pandas as pd
 import pyarrow.parquet as pq
 
+from ..api.client import SalesforceClient
 from ..api.describe.types import FieldInfo
-from .bulk_export import QueryResult, batch_records_async
+from ._threads import run_in_thread
+from .bulk_export import bulk_query, get_bulk_fields
 from .arrow import (
+    ColumnValues,
     salesforce_to_arrow_type,
     create_schema_from_metadata,
-    infer_schema_from_dataframe,
+    infer_schema_from_columns,
     filter_schema_to_data,
-    convert_dataframe_types,
+    RecordSource,
+    ResultPage,
+    iter_result_pages,
+    page_to_columns,
+    columns_to_arrow_batch,
 )
 
+# Where parquet output can go: a path, or a writable binary file-like object
+# (including raw streams such as S3MultipartSink)
+ParquetTarget = Union[str, IO[bytes], io.RawIOBase]
+
+# zstd level used when none is given: close to snappy's write speed while
+# compressing better than Arrow's default zstd level (1)
+DEFAULT_ZSTD_COMPRESSION_LEVEL = 3
+
+# Records per batch when reading a plain async record iterator
+DEFAULT_RECORD_BATCH_SIZE = 10000
+
+
+def _supports_compression_level(compression: str) -> bool:
+    """Check whether a parquet codec accepts a compression level."""
+    try:
+        return bool(pa.Codec.supports_compression_level(compression))
+    except ValueError:
+        # "none" (uncompressed) is not a codec Arrow knows about
+        return False
+
+
+def _compression_level_for(
+    compression: str, compression_level: Optional[int]
+) -> Optional[int]:
+    """Level to pass to pyarrow (None leaves the codec's own default in place)."""
+    if not _supports_compression_level(compression):
+        return None
+    if compression_level is None and compression.lower() == "zstd":
+        return DEFAULT_ZSTD_COMPRESSION_LEVEL
+    return compression_level
+
+
+def _record_batch_size(query_result: RecordSource, batch_size: Optional[int]) -> int:
+    """Batch size to read a source with, warning when it cannot take effect."""
+    if batch_size is not None and hasattr(query_result, "iter_csv_pages"):
+        logging.warning(
+            "ParquetWriter: batch_size has no effect on Bulk QueryResults, which "
+            "are written page by page. Set the page size with bulk_query's "
+            "batch_size instead."
+        )
+    return batch_size or DEFAULT_RECORD_BATCH_SIZE
+
 
 class ParquetWriter:
     """
     Writer class for converting Salesforce QueryResult to Parquet format.
     Supports streaming writes and optional schema from field metadata.
+
+    Output is Zstandard-compressed by default: files are typically 20-30% smaller
+    than snappy for a modest increase in write CPU, and read speed is comparable.
+    Pass ``compression="snappy"`` to favour write speed instead.
+
+    Columns are dictionary-encoded and written with v2 data pages and statistics.
+    Salesforce data is dominated by repeated picklist values and lookup Ids, which
+    dictionary + RLE encoding shrinks considerably, and the statistics let readers
+    skip row groups.
+
+    Converted pages are buffered until ``row_group_size`` rows (or
+    ``row_group_bytes`` of Arrow data) accumulate and then written as one row
+    group, rather than one small row group per page, so readers get large,
+    skippable row groups with meaningful statistics.
+
+    The output file (and its parent directory) is only created once the first
+    page of data is written; ``file_created`` records whether that happened.
     """
 
     def __init__(
         self,
-        file_path: str,
+        file_path: ParquetTarget,
         schema: Optional[pa.Schema] = None,
-        batch_size: int = 10000,
+        batch_size: Optional[int] = None,
         convert_empty_to_null: bool = True,
         column_formatter: Optional[Callable[[str], str]] = None,
         type_mapping_overrides: Optional[Dict[str, pa.DataType]] = None,
+        compression: str = "zstd",
+        compression_level: Optional[int] = None,
+        use_dictionary: bool = True,
+        data_page_version: str = "2.0",
+        row_group_size: int = 1_000_000,
+        row_group_bytes: int = 128 * 1024 * 1024,
     ):
         """
         Initialize ParquetWriter.
 
-        :param file_path: Path to output parquet file
+        :param file_path: Path to output parquet file, or a writable binary file-like
+            object (e.g. an S3MultipartSink). File-like objects are not closed.
         :param schema: Optional PyArrow schema. If None, will be inferred from first batch
-        :param batch_size: Number of records to process in each batch
+        :param batch_size: Records per batch when reading a plain async record
+            iterator (default 10000). Bulk QueryResults are written page by page,
+            so it does not apply to them and a warning is logged if it is set
         :param convert_empty_to_null: Convert empty strings to null values
         :param column_formatter: Optional function to format column names
         :param type_mapping_overrides: Optional dict to override default type mappings
+        :param compression: Parquet compression codec (e.g. "zstd", "snappy", "gzip", "none")
+        :param compression_level: Codec compression level (defaults to 3 for zstd and
+            to the codec's own default otherwise; ignored by codecs without levels)
+        :param use_dictionary: Dictionary-encode columns (the record Id column is always
+            left plain, since unique values gain nothing from a dictionary)
+        :param data_page_version: Parquet data page format version ("1.0" or "2.0")
+        :param row_group_size: Maximum number of records per row group
+        :param row_group_bytes: Flush a row group once this many bytes of Arrow data
+            are buffered, even if row_group_size has not been reached
         """
         self.file_path = file_path
         self.schema = schema
@@ -51,39 +147,46 @@ class ParquetWriter:
         self.convert_empty_to_null = convert_empty_to_null
         self.column_formatter = column_formatter
         self.type_mapping_overrides = type_mapping_overrides
+        self.compression = compression
+        self.compression_level = compression_level
+        self.use_dictionary = use_dictionary
+        self.data_page_version = data_page_version
+        self.row_group_size = row_group_size
+        self.row_group_bytes = row_group_bytes
         self._writer = None
+        self.file_created = False
+        self._pending_batches: List[pa.RecordBatch] = []
+        self._pending_rows = 0
+        self._pending_bytes = 0
         self._schema_finalized = False
 
-        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-
-    async def write_query_result(self, query_result: QueryResult) -> None:
+    async def write_query_result(self, query_result: RecordSource) -> None:
         """
         Write all records from a QueryResult to the parquet file (async version).
 
-        :param query_result: QueryResult to write
+        Pages are parsed, converted and written in a worker thread, so the event
+        loop keeps downloading the next page (and serving other exports) in the
+        meantime. If the task is cancelled, the page being written is finished
+        before the file is closed.
+
+        :param query_result: QueryResult to write, or any async iterable of
+            record dicts
         """
         try:
-            async for batch in batch_records_async(query_result, self.batch_size):
-                self._write_batch(batch)
+            batch_size = _record_batch_size(query_result, self.batch_size)
+            async for page in iter_result_pages(query_result, batch_size):
+                await run_in_thread(self._write_page, page)
         finally:
-            self.close()
-
-    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
-        """Write a batch of records to the parquet file."""
-        if not batch:
-            return
+            await run_in_thread(self.close)
 
-        converted_batch = []
-        for record in batch:
-            if self.column_formatter:
-                converted_record = {
-                    self.column_formatter(k): v for k, v in record.items()
-                }
-            else:
-                converted_record = record.copy()
-            converted_batch.append(converted_record)
+    def _write_page(self, page: ResultPage) -> None:
+        """Pivot a results page (CSV or record dicts) and write it to the file."""
+        self._write_columns(page_to_columns(page, self.column_formatter))
 
-        df = pd.DataFrame(converted_batch)
+    def _write_columns(self, columns: Dict[str, ColumnValues]) -> None:
+        """Convert columns to the target schema and write them to the parquet file."""
+        if not columns:
+            return
 
         if not self._schema_finalized:
             if self.schema is None:
@@ -93,51 +196,106 @@ class ParquetWriter:
                         "is inferred from data (no fields_metadata provided). Pass a "
                         "pre-built schema or supply fields_metadata via write_query_to_parquet."
                     )
-                self.schema = infer_schema_from_dataframe(df)
+                self.schema = infer_schema_from_columns(columns)
             else:
-                self.schema = filter_schema_to_data(self.schema, list(df.columns))
+                self.schema = filter_schema_to_data(self.schema, list(columns))
             self._schema_finalized = True
 
-        convert_dataframe_types(df, self.schema, self.convert_empty_to_null)
-        table = pa.Table.from_pandas(df, schema=self.schema)
+        record_batch = columns_to_arrow_batch(
+            columns, self.schema, self.convert_empty_to_null
+        )
 
         if self._writer is None:
-            self._writer = pq.ParquetWriter(self.file_path, self.schema)
+            # Directories are only created once there is data to write
+            if isinstance(self.file_path, str):
+                Path(self.file_path).parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(
+                self.file_path,
+                self.schema,
+                compression=self.compression,
+                compression_level=_compression_level_for(
+                    self.compression, self.compression_level
+                ),
+                use_dictionary=self._dictionary_columns(),
+                data_page_version=self.data_page_version,
+                write_statistics=True,
+            )
+            self.file_created = True
+
+        self._pending_batches.append(record_batch)
+        self._pending_rows += record_batch.num_rows
+        self._pending_bytes += record_batch.nbytes
+        if (
+            self._pending_rows >= self.row_group_size
+            or self._pending_bytes >= self.row_group_bytes
+        ):
+            self._flush_row_group()
+
+    def _flush_row_group(self) -> None:
+        """Write buffered batches out as row group(s) of at most row_group_size rows."""
+        if self._writer is None or not self._pending_batches:
+            return
+
+        table = pa.Table.from_batches(self._pending_batches, schema=self.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self._pending_batches = []
+        self._pending_rows = 0
+        self._pending_bytes = 0
 
-        self._writer.write_table(table)
+    def _dictionary_columns(self) -> Union[bool, List[str]]:
+        """Columns to dictionary-encode: everything except the record Id."""
+        if not self.use_dictionary or self.schema is None:
+            return False
+        return [field.name for field in self.schema if field.name.lower() != "id"]
 
     def close(self) -> None:
-        """Close the parquet writer."""
+        """Flush any buffered rows and close the parquet writer."""
         if self._writer:
-            self._writer.close()
-            self._writer = None
+            try:
+                self._flush_row_group()
+            finally:
+                self._writer.close()
+                self._writer = None
 
 
 async def write_query_to_parquet(
-    query_result: QueryResult,
-    file_path: str,
+    query_result: RecordSource,
+    file_path: ParquetTarget,
     fields_metadata: Optional[List[FieldInfo]] = None,
     schema: Optional[pa.Schema] = None,
-    batch_size: int = 10000,
+    batch_size: Optional[int] = None,
     convert_empty_to_null: bool = True,
     column_formatter: Optional[Callable[[str], str]] = None,
     type_mapping_overrides: Optional[Dict[str, pa.DataType]] = None,
-) -> None:
+    compression: str = "zstd",
+    compression_level: Optional[int] = None,
+    narrow_numeric_types: bool = False,
+) -> bool:
     """
     Convenience function to write a QueryResult to a parquet file (async version).
 
-    :param query_result: QueryResult to write
-    :param file_path: Path to output parquet file
+    :param query_result: QueryResult to write, or any async iterable of record dicts
+    :param file_path: Path to output parquet file, or a writable binary file-like object
     :param fields_metadata: Optional Salesforce field metadata for schema creation
     :param schema: Optional pre-created PyArrow schema (takes precedence over fields_metadata)
-    :param batch_size: Number of records to process in each batch
+    :param batch_size: Records per batch when reading a plain async record iterator
+        (default 10000; not applicable to Bulk QueryResults, see ParquetWriter)
     :param convert_empty_to_null: Convert empty strings to null values
     :param column_formatter: Optional function to format column names
     :param type_mapping_overrides: Optional dict to override default type mappings
+    :param compression: Parquet compression codec (e.g. "zstd", "snappy", "gzip", "none")
+    :param compression_level: Codec compression level (defaults to 3 for zstd and to
+        the codec's own default otherwise; ignored by codecs without levels)
+    :param narrow_numeric_types: Store whole-number fields as int32/int64 sized by
+        their declared precision (only applies to fields_metadata schemas)
+    :returns: True if a file was written (False if the query returned no data)
     """
     effective_schema = schema or (
         create_schema_from_metadata(
-            fields_metadata, column_formatter, type_mapping_overrides
+            fields_metadata,
+            column_formatter,
+            type_mapping_overrides,
+            narrow_numeric_types=narrow_numeric_types,
         )
         if fields_metadata
         else None
@@ -150,6 +308,411 @@ async def write_query_to_parquet(
         convert_empty_to_null=convert_empty_to_null,
         column_formatter=column_formatter,
         type_mapping_overrides=type_mapping_overrides,
+        compression=compression,
+        compression_level=compression_level,
     )
 
     await writer.write_query_result(query_result)
+    return writer.file_created
+
+
+async def write_query_to_parquet_files(
+    query_result: RecordSource,
+    file_paths: Sequence[ParquetTarget],
+    fields_metadata: Optional[List[FieldInfo]] = None,
+    schema: Optional[pa.Schema] = None,
+    convert_empty_to_null: bool = True,
+    column_formatter: Optional[Callable[[str], str]] = None,
+    type_mapping_overrides: Optional[Dict[str, pa.DataType]] = None,
+    compression: str = "zstd",
+    compression_level: Optional[int] = None,
+    narrow_numeric_types: bool = False,
+    row_group_bytes: int = 128 * 1024 * 1024,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Write a QueryResult across several parquet files (shards).
+
+    Results pages are dealt round-robin to one ParquetWriter per file, so each
+    file holds whole pages and roughly ``1 / len(file_paths)`` of the records.
+    Downstream readers (and uploads, when the targets are S3MultipartSinks) can
+    then work on the shards in parallel instead of streaming a single file.
+    Shards that would receive no records are not created.
+
+    Sharding does not parallelize writing: pages are still parsed and written one
+    at a time in a worker thread. Every shard buffers its own row group, so
+    ``row_group_bytes`` is split evenly between them to keep the memory used per
+    export the same as for a single file; the trade-off is smaller row groups.
+
+    File-like targets with ``finish()`` and ``abort()`` methods (such as
+    S3MultipartSink) are finished once all shards are written, or aborted if the
+    export fails. Other file-like objects are left open.
+
+    :param query_result: QueryResult to write, or any async iterable of record dicts
+    :param file_paths: Output parquet file paths, or writable binary file-like objects
+    :param fields_metadata: Optional Salesforce field metadata for schema creation
+    :param schema: Optional pre-created PyArrow schema (takes precedence over fields_metadata)
+    :param convert_empty_to_null: Convert empty strings to null values
+    :param column_formatter: Optional function to format column names
+    :param type_mapping_overrides: Optional dict to override default type mappings
+    :param compression: Parquet compression codec (e.g. "zstd", "snappy", "gzip", "none")
+    :param compression_level: Codec compression level (defaults to 3 for zstd and to
+        the codec's own default otherwise; ignored by codecs without levels)
+    :param narrow_numeric_types: Store whole-number fields as int32/int64 sized by
+        their declared precision (only applies to fields_metadata schemas)
+    :param row_group_bytes: Arrow data buffered across all shards before row
+        groups are flushed
+    :param batch_size: Records per page when reading a plain async record iterator
+        (default 10000; not applicable to Bulk QueryResults, see ParquetWriter)
+    :returns: Number of files written
+    :raises ValueError: If file_paths is empty
+    """
+    if not file_paths:
+        raise ValueError("file_paths must not be empty")
+
+    effective_schema = schema or (
+        create_schema_from_metadata(
+            fields_metadata,
+            column_formatter,
+            type_mapping_overrides,
+            narrow_numeric_types=narrow_numeric_types,
+        )
+        if fields_metadata
+        else None
+    )
+
+    writers = [
+        ParquetWriter(
+            file_path=file_path,
+            schema=effective_schema,
+            convert_empty_to_null=convert_empty_to_null,
+            column_formatter=column_formatter,
+            type_mapping_overrides=type_mapping_overrides,
+            compression=compression,
+            compression_level=compression_level,
+            row_group_bytes=max(row_group_bytes // len(file_paths), 1),
+        )
+        for file_path in file_paths
+    ]
+
+    pages_written = 0
+
+    def write_page(page: ResultPage) -> bool:
+        columns = page_to_columns(page, column_formatter)
+        if not columns or not len(next(iter(columns.values()))):
+            return False
+        writers[pages_written % len(writers)]._write_columns(columns)
+        return True
+
+    def finish_writers() -> None:
+        for writer in writers:
+            writer.close()
+        for file_path in file_paths:
+            finish = getattr(file_path, "finish", None)
+            if callable(finish):
+                finish()
+
+    def abort_writers() -> None:
+        try:
+            for writer in writers:
+                writer.close()
+        finally:
+            for file_path in file_paths:
+                abort = getattr(file_path, "abort", None)
+                if callable(abort):
+                    abort()
+
+    try:
+        record_batch_size = _record_batch_size(query_result, batch_size)
+        async for page in iter_result_pages(query_result, record_batch_size):
+            if await run_in_thread(write_page, page):
+                pages_written += 1
+        await run_in_thread(finish_writers)
+    except BaseException:
+        await run_in_thread(abort_writers)
+        raise
+
+    return sum(writer.file_created for writer in writers)
+
+
+# Field used to export only records changed since a previous run
+WATERMARK_FIELD = "SystemModstamp"
+
+
+class SObjectExportResult(TypedDict):
+    """Summary of a single SObject export."""
+
+    sobject_type: str
+    file_path: str
+    records_exported: int
+    files_created: int
+    watermark: Optional[str]
+
+
+def _format_soql_datetime(value: datetime) -> str:
+    """Format an aware datetime as a SOQL dateTime literal (UTC, whole seconds)."""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_modified_since(value: Union[str, datetime]) -> str:
+    """
+    Validate a modified_since value and return it as a SOQL dateTime literal.
+
+    Strings are parsed rather than spliced into the query, so only a well-formed
+    ISO 8601 datetime can reach the WHERE clause.
+
+    :raises ValueError: If the value is not a datetime or has no timezone
+    """
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(
+                f"modified_since is not an ISO 8601 datetime: {value!r}"
+            ) from None
+    elif isinstance(value, datetime):
+        parsed = value
+    else:
+        raise ValueError(f"modified_since must be a datetime or string: {value!r}")
+    if parsed.tzinfo is None:
+        raise ValueError(f"modified_since must include a timezone: {value!r}")
+    return _format_soql_datetime(parsed)
+
+
+def _max_column_value(file_paths: List[str], column: str) -> Optional[Any]:
+    """Largest value of a column according to the parquet row group statistics."""
+    maximum = None
+    for file_path in file_paths:
+        if not Path(file_path).exists():
+            continue
+        metadata = pq.read_metadata(file_path)
+        if column not in metadata.schema.names:
+            continue
+        index = metadata.schema.names.index(column)
+        for i in range(metadata.num_row_groups):
+            statistics = metadata.row_group(i).column(index).statistics
+            if statistics is not None and statistics.has_min_max:
+                if maximum is None or statistics.max > maximum:
+                    maximum = statistics.max
+    return maximum
+
+
+async def export_sobject_to_parquet(
+    sf: SalesforceClient,
+    sobject_type: str,
+    file_path: str,
+    all_rows: bool = False,
+    batch_size: int = 10000,
+    convert_empty_to_null: bool = True,
+    column_formatter: Optional[Callable[[str], str]] = None,
+    type_mapping_overrides: Optional[Dict[str, pa.DataType]] = None,
+    compression: str = "zstd",
+    compression_level: Optional[int] = None,
+    narrow_numeric_types: bool = False,
+    files_per_sobject: int = 1,
+    modified_since: Optional[Union[str, datetime]] = None,
+) -> SObjectExportResult:
+    """
+    Export every bulk-queryable field of an SObject to a parquet file.
+
+    Describes the SObject (reusing the client's cached describe when available),
+    queries its bulk-compatible fields explicitly rather than every field, and
+    writes the result with a schema built from the field metadata.
+
+    With ``files_per_sobject`` greater than 1, ``file_path`` is treated as a
+    directory and the records are sharded across
+    ``{file_path}/part-00000.parquet``, ``part-00001.parquet``, ... (see
+    ``write_query_to_parquet_files``), which readers can load as one dataset.
+
+    For incremental exports, pass the ``watermark`` returned by the previous run
+    as ``modified_since`` to fetch only records whose SystemModstamp is later.
+    The returned watermark is the latest SystemModstamp written (truncated to
+    the second, so the next run may repeat records from that final second), or
+    ``modified_since`` unchanged when nothing was exported. It is read from the
+    parquet column statistics, so no extra query is needed.
+
+    :param sf: Salesforce client instance
+    :param sobject_type: Salesforce object type (e.g., 'Account', 'Contact')
+    :param file_path: Path to output parquet file (or directory when sharding)
+    :param all_rows: If True, includes deleted and archived records
+    :param batch_size: Number of records to fetch per results page
+    :param convert_empty_to_null: Convert empty strings to null values
+    :param column_formatter: Optional function to format column names
+    :param type_mapping_overrides: Optional dict to override default type mappings
+    :param compression: Parquet compression codec (e.g. "zstd", "snappy", "gzip", "none")
+    :param compression_level: Codec compression level (defaults to 3 for zstd and to
+        the codec's own default otherwise; ignored by codecs without levels)
+    :param narrow_numeric_types: Store whole-number fields as int32/int64 sized by
+        their declared precision
+    :param files_per_sobject: Number of parquet files to shard the records across
+    :param modified_since: Only export records with a later SystemModstamp (a
+        timezone-aware datetime, or an ISO 8601 string with an offset such as a
+        previous ``watermark``)
+    :returns: Export summary
+    :raises ValueError: If files_per_sobject is invalid, or modified_since is not a
+        timezone-aware datetime or is given for an SObject without a
+        SystemModstamp field
+    """
+    if files_per_sobject <= 0:
+        raise ValueError("files_per_sobject must be greater than 0")
+    since = (
+        _parse_modified_since(modified_since) if modified_since is not None else None
+    )
+
+    describe = await sf.describe.sobject(sobject_type, use_cache=True)
+    fields_metadata = await get_bulk_fields(describe["fields"])
+    field_names = [field["name"] for field in fields_metadata]
+
+    soql_query = f"SELECT {', '.join(field_names)} FROM {sobject_type}"
+    if since is not None:
+        if WATERMARK_FIELD not in field_names:
+            raise ValueError(
+                f"{sobject_type} has no {WATERMARK_FIELD} field to filter on"
+            )
+        soql_query += f" WHERE {WATERMARK_FIELD} > {since}"
+
+    query_result = await bulk_query(
+        sf=sf,
+        soql_query=soql_query,
+        all_rows=all_rows,
+        batch_size=batch_size,
+    )
+    if files_per_sobject == 1:
+        file_created = await write_query_to_parquet(
+            query_result=query_result,
+            file_path=file_path,
+            fields_metadata=fields_metadata,
+            convert_empty_to_null=convert_empty_to_null,
+            column_formatter=column_formatter,
+            type_mapping_overrides=type_mapping_overrides,
+            compression=compression,
+            compression_level=compression_level,
+            narrow_numeric_types=narrow_numeric_types,
+        )
+        files_created = int(file_created)
+        file_paths = [file_path][:files_created]
+    else:
+        file_paths = [
+            str(Path(file_path) / f"part-{i:05d}.parquet")
+            for i in range(files_per_sobject)
+        ]
+        files_created = await write_query_to_parquet_files(
+            query_result=query_result,
+            file_paths=file_paths,
+            fields_metadata=fields_metadata,
+            convert_empty_to_null=convert_empty_to_null,
+            column_formatter=column_formatter,
+            type_mapping_overrides=type_mapping_overrides,
+            compression=compression,
+            compression_level=compression_level,
+            narrow_numeric_types=narrow_numeric_types,
+        )
+        file_paths = file_paths[:files_created]
+
+    watermark = None
+    if WATERMARK_FIELD in field_names:
+        latest = await asyncio.to_thread(
+            _max_column_value,
+            file_paths,
+            column_formatter(WATERMARK_FIELD) if column_formatter else WATERMARK_FIELD,
+        )
+        if isinstance(latest, datetime):
+            # Salesforce datetimes are UTC, including under a tz-less type override
+            if latest.tzinfo is None:
+                latest = latest.replace(tzinfo=timezone.utc)
+            watermark = _format_soql_datetime(latest)
+    if watermark is None:
+        watermark = since
+
+    return {
+        "sobject_type": sobject_type,
+        "file_path": file_path,
+        "records_exported": query_result.total_records or 0,
+        "files_created": files_created,
+        "watermark": watermark,
+    }
+
+
+async def export_sobjects_to_parquet(
+    sf: SalesforceClient,
+    sobject_types: List[str],
+    output_dir: str,
+    max_concurrent: int = 4,
+    all_rows: bool = False,
+    batch_size: int = 10000,
+    convert_empty_to_null: bool = True,
+    column_formatter: Optional[Callable[[str], str]] = None,
+    type_mapping_overrides: Optional[Dict[str, pa.DataType]] = None,
+    compression: str = "zstd",
+    compression_level: Optional[int] = None,
+    narrow_numeric_types: bool = False,
+    files_per_sobject: int = 1,
+    modified_since: Optional[Dict[str, Union[str, datetime]]] = None,
+) -> List[SObjectExportResult]:
+    """
+    Export several SObjects concurrently, one parquet file per SObject.
+
+    Each export spends most of its time waiting on Salesforce (job polling and
+    results pages), so running them concurrently over the shared client cuts
+    wall-clock time roughly by ``max_concurrent``. Files are written to
+    ``{output_dir}/{sobject_type}.parquet``, or sharded into
+    ``{output_dir}/{sobject_type}/part-NNNNN.parquet`` when ``files_per_sobject``
+    is greater than 1.
+
+    Each running export buffers up to one row group (about 128 MB of Arrow data,
+    shared between its shards), so peak memory grows with ``max_concurrent``.
+
+    :param sf: Salesforce client instance
+    :param sobject_types: Salesforce object types to export
+    :param output_dir: Directory to write parquet files to
+    :param max_concurrent: Maximum number of SObjects exported at the same time
+    :param all_rows: If True, includes deleted and archived records
+    :param batch_size: Number of records to fetch per results page
+    :param convert_empty_to_null: Convert empty strings to null values
+    :param column_formatter: Optional function to format column names
+    :param type_mapping_overrides: Optional dict to override default type mappings
+    :param compression: Parquet compression codec (e.g. "zstd", "snappy", "gzip", "none")
+    :param compression_level: Codec compression level (defaults to 3 for zstd and to
+        the codec's own default otherwise; ignored by codecs without levels)
+    :param narrow_numeric_types: Store whole-number fields as int32/int64 sized by
+        their declared precision
+    :param files_per_sobject: Number of parquet files to shard each SObject across
+    :param modified_since: Optional mapping of SObject type to the watermark of its
+        previous export; mapped SObjects only export records changed since then
+    :returns: Export summaries in the same order as sobject_types
+    :raises ValueError: If max_concurrent is invalid
+    """
+    if max_concurrent <= 0:
+        raise ValueError("max_concurrent must be greater than 0")
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def export_with_semaphore(sobject_type: str) -> SObjectExportResult:
+        async with semaphore:
+            return await export_sobject_to_parquet(
+                sf=sf,
+                sobject_type=sobject_type,
+                file_path=str(
+                    Path(output_dir)
+                    / (
+                        f"{sobject_type}.parquet"
+                        if files_per_sobject == 1
+                        else sobject_type
+                    )
+                ),
+                all_rows=all_rows,
+                batch_size=batch_size,
+                convert_empty_to_null=convert_empty_to_null,
+                column_formatter=column_formatter,
+                type_mapping_overrides=type_mapping_overrides,
+                compression=compression,
+                compression_level=compression_level,
+                files_per_sobject=files_per_sobject,
+                narrow_numeric_types=narrow_numeric_types,
+                modified_since=(modified_since or {}).get(sobject_type),
+            )
+
+    # asyncio.gather() preserves order
+    return list(
+        await asyncio.gather(*(export_with_semaphore(s) for s in sobject_types))
+    )
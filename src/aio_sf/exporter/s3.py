@@ -0,0 +1,458 @@
+"""
+S3 upload helpers for exported files.
+
+boto3 is synchronous, so transfers run in a worker thread to keep the event loop
+free for Salesforce requests.
+"""
+
+import asyncio
+import io
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import boto3
+import pyarrow as pa
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from ..api.describe.types import FieldInfo
+from ._threads import run_in_thread
+from .arrow import RecordSource
+from .parquet_writer import write_query_to_parquet
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# S3 rejects multipart parts smaller than this (except the last one)
+MIN_PART_SIZE = 5 * MB
+
+# Smallest connection pool given to clients created here (botocore defaults to 10)
+MIN_POOL_CONNECTIONS = 32
+
+
+def create_s3_client(
+    max_pool_connections: int = MIN_POOL_CONNECTIONS,
+    max_attempts: int = 10,
+    retry_mode: str = "adaptive",
+    session: Optional[boto3.session.Session] = None,
+    region_name: Optional[str] = None,
+) -> Any:
+    """
+    Create a boto3 S3 client sized for concurrent uploads.
+
+    botocore's default pool holds 10 connections, so parallel part uploads (and
+    several exports sharing a client) queue on the pool and log "Connection pool
+    is full" warnings. The client is thread-safe and should be shared.
+
+    Pass the bucket's ``region_name`` (see get_bucket_region) so requests go
+    straight to the regional, virtual-hosted endpoint instead of being
+    redirected when the bucket lives outside the client's default region.
+
+    :param max_pool_connections: Maximum number of pooled HTTP connections
+    :param max_attempts: Maximum attempts per request, including the first
+    :param retry_mode: botocore retry mode ("adaptive" also rate-limits on throttling)
+    :param session: Optional boto3 session (the default session is used if None)
+    :param region_name: Optional region of the bucket(s) the client will use
+    :returns: boto3 S3 client
+    """
+    config = Config(
+        max_pool_connections=max_pool_connections,
+        retries={"max_attempts": max_attempts, "mode": retry_mode},
+        tcp_keepalive=True,
+        s3={"addressing_style": "virtual"} if region_name else None,
+    )
+    return (session or boto3).client("s3", region_name=region_name, config=config)
+
+
+# Bucket name -> region, filled by get_bucket_region (failed lookups aren't cached)
+_bucket_regions: Dict[str, str] = {}
+
+
+def get_bucket_region(bucket: str, s3_client: Optional[Any] = None) -> Optional[str]:
+    """
+    Look up the region of an S3 bucket, once per bucket per process.
+
+    Lookups that fail (e.g. a transient network error hiding the header) are
+    not cached, so the next call tries again.
+
+    Uses a single ``head_bucket`` request and reads the ``x-amz-bucket-region``
+    header, which S3 also returns on redirect and access-denied errors.
+
+    :param bucket: S3 bucket name
+    :param s3_client: Optional boto3 S3 client used for the lookup
+    :returns: Bucket region, or None if it could not be determined
+    """
+    if bucket in _bucket_regions:
+        return _bucket_regions[bucket]
+
+    client = s3_client or _default_s3_client(MIN_POOL_CONNECTIONS, None)
+    try:
+        response = client.head_bucket(Bucket=bucket)
+    except ClientError as e:
+        response = e.response
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    region: Optional[str] = headers.get("x-amz-bucket-region")
+    if region is None:
+        logger.warning(f"Could not determine the region of S3 bucket {bucket}")
+    else:
+        _bucket_regions[bucket] = region
+    return region
+
+
+# Shared clients keyed by (max_pool_connections, region_name). boto3 sessions are
+# not thread-safe and these are requested from to_thread workers, so clients are
+# built one at a time from a dedicated session rather than boto3's default one.
+_default_clients: Dict[Tuple[int, Optional[str]], Any] = {}
+_default_clients_lock = threading.Lock()
+_default_session: Optional[boto3.session.Session] = None
+
+
+def _default_s3_client(max_pool_connections: int, region_name: Optional[str]) -> Any:
+    """Shared client used when callers don't pass their own."""
+    global _default_session
+    key = (max_pool_connections, region_name)
+    with _default_clients_lock:
+        if key not in _default_clients:
+            if _default_session is None:
+                _default_session = boto3.session.Session()
+            _default_clients[key] = create_s3_client(
+                max_pool_connections=max_pool_connections,
+                region_name=region_name,
+                session=_default_session,
+            )
+        return _default_clients[key]
+
+
+def _default_client_for(bucket: str, max_concurrency: int) -> Any:
+    """Shared client for a bucket's region, with a pool sized for max_concurrency."""
+    return _default_s3_client(
+        max(MIN_POOL_CONNECTIONS, max_concurrency * 2), get_bucket_region(bucket)
+    )
+
+
+def create_transfer_config(
+    max_concurrency: int = 10,
+    multipart_threshold: int = 8 * MB,
+    multipart_chunksize: int = 16 * MB,
+) -> TransferConfig:
+    """
+    Build the TransferConfig used for S3 uploads.
+
+    Files above ``multipart_threshold`` are uploaded as a multipart upload with up
+    to ``max_concurrency`` parts in flight, instead of a single PUT (which is also
+    capped at 5 GB).
+
+    :param max_concurrency: Maximum number of parts uploaded in parallel
+    :param multipart_threshold: File size in bytes above which multipart is used
+    :param multipart_chunksize: Size in bytes of each uploaded part
+    :returns: TransferConfig for boto3 transfer methods
+    """
+    return TransferConfig(
+        multipart_threshold=multipart_threshold,
+        max_concurrency=max_concurrency,
+        multipart_chunksize=multipart_chunksize,
+        use_threads=True,
+    )
+
+
+async def upload_file_to_s3(
+    file_path: str,
+    bucket: str,
+    key: str,
+    s3_client: Optional[Any] = None,
+    max_concurrency: int = 10,
+    multipart_threshold: int = 8 * MB,
+    multipart_chunksize: int = 16 * MB,
+) -> None:
+    """
+    Upload a local file (e.g. an exported parquet file) to S3.
+
+    :param file_path: Path of the file to upload
+    :param bucket: Destination S3 bucket
+    :param key: Destination S3 key
+    :param s3_client: Optional boto3 S3 client (a shared client for the
+        bucket's region is used if None)
+    :param max_concurrency: Maximum number of parts uploaded in parallel
+    :param multipart_threshold: File size in bytes above which multipart is used
+    :param multipart_chunksize: Size in bytes of each uploaded part
+    """
+    # Resolving the default client may call head_bucket, so keep it off the loop
+    client: Any = s3_client or await asyncio.to_thread(
+        _default_client_for, bucket, max_concurrency
+    )
+    config = create_transfer_config(
+        max_concurrency=max_concurrency,
+        multipart_threshold=multipart_threshold,
+        multipart_chunksize=multipart_chunksize,
+    )
+
+    logger.info(f"Uploading {file_path} to s3://{bucket}/{key}")
+    await asyncio.to_thread(client.upload_file, file_path, bucket, key, Config=config)
+
+
+class S3MultipartSink(io.RawIOBase):
+    """
+    Writable binary file-like object that streams its bytes to an S3 object.
+
+    Bytes are buffered until ``part_size`` is reached and each full part is handed
+    to a thread pool for ``upload_part`` while writing continues, so the upload
+    overlaps with producing the data. The sink itself holds at most about
+    ``part_size * (max_concurrency + 1)`` bytes regardless of the object size,
+    since writes block once ``max_concurrency`` parts are in flight. Whatever
+    feeds it buffers separately: a ParquetWriter keeps up to one row group
+    (``row_group_bytes``, 128 MB by default) of Arrow data before writing it
+    out. Output smaller than one part is sent with a single ``put_object`` by
+    finish().
+
+    Only finish() publishes the object, so partial output never lands in S3.
+    Leaving a ``with`` block normally calls it and leaving with an exception
+    calls abort(). close() (which also runs on garbage collection) makes no S3
+    requests: a multipart upload started by an unfinished sink is left for an
+    explicit abort() or a bucket lifecycle rule to clean up. Nothing is written
+    to S3 if no bytes were written.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        s3_client: Optional[Any] = None,
+        part_size: int = 16 * MB,
+        max_concurrency: int = 8,
+    ):
+        """
+        Initialize S3MultipartSink.
+
+        :param bucket: Destination S3 bucket
+        :param key: Destination S3 key
+        :param s3_client: Optional boto3 S3 client (a shared client for
+            the bucket's region is used if None)
+        :param part_size: Size in bytes of each uploaded part (at least 5 MB)
+        :param max_concurrency: Maximum number of parts uploaded in parallel
+        :raises ValueError: If part_size or max_concurrency is invalid
+        """
+        super().__init__()
+        # Set before validation so close() from __del__ is safe on a failed init
+        self._completed = False
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id: Optional[str] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List["Future[Dict[str, Any]]"] = []
+
+        if part_size < MIN_PART_SIZE:
+            raise ValueError("part_size must be at least 5 MB")
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than 0")
+
+        self.bucket = bucket
+        self.key = key
+        self._client = s3_client or _default_client_for(bucket, max_concurrency)
+        self._part_size = part_size
+        self._max_concurrency = max_concurrency
+        self._parts: List[Dict[str, Any]] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        """Return the number of bytes written so far."""
+        return self._position
+
+    def write(self, b: Any) -> int:
+        """Buffer bytes, submitting a part upload each time a full part is ready."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        size = memoryview(b).nbytes
+        self._buffer += b
+        self._position += size
+
+        while len(self._buffer) >= self._part_size:
+            part = bytes(self._buffer[: self._part_size])
+            del self._buffer[: self._part_size]
+            self._submit_part(part)
+
+        return size
+
+    def _submit_part(self, body: bytes) -> None:
+        """Start uploading a part, waiting for the oldest one if the pool is full."""
+        if self._upload_id is None:
+            response = self._client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key
+            )
+            self._upload_id = response["UploadId"]
+            self._executor = ThreadPoolExecutor(max_workers=self._max_concurrency)
+
+        if len(self._pending) >= self._max_concurrency:
+            self._parts.append(self._pending.pop(0).result())
+
+        part_number = len(self._parts) + len(self._pending) + 1
+        assert self._executor is not None
+        self._pending.append(
+            self._executor.submit(self._upload_part, part_number, body)
+        )
+
+    def _upload_part(self, part_number: int, body: bytes) -> Dict[str, Any]:
+        response = self._client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def finish(self) -> None:
+        """Upload any buffered bytes, complete the upload and close the sink."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        try:
+            if self._upload_id is None:
+                if self._position:
+                    self._client.put_object(
+                        Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer)
+                    )
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                self._parts.extend(future.result() for future in self._pending)
+                self._pending = []
+                self._client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": self._parts},
+                )
+            self._completed = True
+            logger.info(
+                f"Uploaded {self._position} bytes to s3://{self.bucket}/{self.key}"
+            )
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            super().close()
+
+    def close(self) -> None:
+        """Mark the sink closed without publishing or aborting anything."""
+        if not self.closed and not self._completed and self._upload_id is not None:
+            logger.warning(
+                f"S3MultipartSink for s3://{self.bucket}/{self.key} closed without "
+                f"finish() or abort(); multipart upload {self._upload_id} is left "
+                "incomplete"
+            )
+        super().close()
+
+    def abort(self) -> None:
+        """Discard buffered bytes and abort the multipart upload, if one was started."""
+        if self._completed:
+            # Already published by finish(); there is nothing left to abort
+            return
+        for future in self._pending:
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._pending = []
+        self._buffer = bytearray()
+
+        if self._upload_id is not None:
+            upload_id, self._upload_id = self._upload_id, None
+            try:
+                self._client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, UploadId=upload_id
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to abort multipart upload for s3://{self.bucket}/{self.key}: {e}"
+                )
+        super().close()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is not None:
+            self.abort()
+        elif not self.closed:
+            self.finish()
+
+
+async def write_query_to_s3(
+    query_result: RecordSource,
+    bucket: str,
+    key: str,
+    s3_client: Optional[Any] = None,
+    part_size: int = 16 * MB,
+    max_concurrency: int = 8,
+    fields_metadata: Optional[List[FieldInfo]] = None,
+    schema: Optional[pa.Schema] = None,
+    convert_empty_to_null: bool = True,
+    column_formatter: Optional[Callable[[str], str]] = None,
+    type_mapping_overrides: Optional[Dict[str, pa.DataType]] = None,
+    compression: str = "zstd",
+    compression_level: Optional[int] = None,
+    narrow_numeric_types: bool = False,
+) -> None:
+    """
+    Write a QueryResult as parquet directly to S3, without a local file.
+
+    Parquet bytes are streamed into an S3MultipartSink, so parts are uploaded while
+    later pages are still being fetched and written. The upload is aborted if the
+    export fails. Creating, finishing and aborting the sink make blocking boto3
+    calls, so they run in a worker thread.
+
+    :param query_result: QueryResult to write, or any async iterable of record dicts
+    :param bucket: Destination S3 bucket
+    :param key: Destination S3 key
+    :param s3_client: Optional boto3 S3 client (a shared client for the
+        bucket's region is used if None)
+    :param part_size: Size in bytes of each uploaded part (at least 5 MB)
+    :param max_concurrency: Maximum number of parts uploaded in parallel
+    :param fields_metadata: Optional Salesforce field metadata for schema creation
+    :param schema: Optional pre-created PyArrow schema (takes precedence over fields_metadata)
+    :param convert_empty_to_null: Convert empty strings to null values
+    :param column_formatter: Optional function to format column names
+    :param type_mapping_overrides: Optional dict to override default type mappings
+    :param compression: Parquet compression codec (e.g. "zstd", "snappy", "gzip", "none")
+    :param compression_level: Codec compression level (defaults to 3 for zstd and to
+        the codec's own default otherwise; ignored by codecs without levels)
+    :param narrow_numeric_types: Store whole-number fields as int32/int64 sized by
+        their declared precision (only applies to fields_metadata schemas)
+    """
+    sink = await asyncio.to_thread(
+        S3MultipartSink,
+        bucket,
+        key,
+        s3_client=s3_client,
+        part_size=part_size,
+        max_concurrency=max_concurrency,
+    )
+    try:
+        await write_query_to_parquet(
+            query_result=query_result,
+            file_path=sink,
+            fields_metadata=fields_metadata,
+            schema=schema,
+            convert_empty_to_null=convert_empty_to_null,
+            column_formatter=column_formatter,
+            type_mapping_overrides=type_mapping_overrides,
+            compression=compression,
+            compression_level=compression_level,
+            narrow_numeric_types=narrow_numeric_types,
+        )
+    except BaseException:
+        await run_in_thread(sink.abort)
+        raise
+    await run_in_thread(sink.finish)
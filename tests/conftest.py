@@ -1,5 +1,7 @@
 """Pytest configuration and fixtures for aio-sf tests."""
 
+import json
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from aio_sf import SalesforceClient
@@ -44,6 +46,7 @@ def mock_http_response():
             return json_data or {}
 
         mock_response.json = json_method
+        mock_response.content = json.dumps(json_data or {}).encode("utf-8")
 
         # Make raise_for_status() a callable that does nothing
         def raise_for_status_method():
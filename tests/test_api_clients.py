@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, ANY
 from aio_sf.api.describe import DescribeAPI
 from aio_sf.api.query import QueryAPI
 from aio_sf.api.collections import CollectionsAPI
+from aio_sf.api import _json
 
 
 class TestDescribeAPI:
@@ -63,6 +64,31 @@ class TestDescribeAPI:
         assert len(account_describe["fields"]) == 2
         assert mock_http_client.get.called or mock_http_client.request.called
 
+    @pytest.mark.asyncio
+    async def test_describe_sobject_cache(self, mock_client, mock_http_response):
+        """Test describes are cached and reused only when use_cache is set."""
+        client, mock_http_client = mock_client
+        describe_api = DescribeAPI(client)
+
+        mock_response = mock_http_response({"name": "Account", "fields": []})
+        mock_http_client.request = AsyncMock(return_value=mock_response)
+
+        await describe_api.sobject("Account")
+        assert describe_api._sobject_cache == {}
+
+        cached = await describe_api.sobject("Account", use_cache=True)
+        cached["fields"].append({"name": "Mutated"})
+        again = await describe_api.sobject("Account", use_cache=True)
+        assert mock_http_client.request.call_count == 2
+        assert again["fields"] == []
+
+        await describe_api.sobject("Account")
+        assert mock_http_client.request.call_count == 3
+
+        describe_api.clear_cache()
+        await describe_api.sobject("Account", use_cache=True)
+        assert mock_http_client.request.call_count == 4
+
     @pytest.mark.asyncio
     async def test_get_limits(self, mock_client, mock_http_response):
         """Test getting organization limits."""
@@ -120,6 +146,36 @@ class TestQueryAPI:
         assert records[1]["Name"] == "Test Account 2"
         assert mock_http_client.get.called or mock_http_client.request.called
 
+    @pytest.mark.asyncio
+    async def test_collect_all_follows_pages(self, mock_client, mock_http_response):
+        """Test collect_all gathers the initial page and every QueryMore page."""
+        client, mock_http_client = mock_client
+        responses = [
+            mock_http_response(
+                {
+                    "totalSize": 3,
+                    "done": False,
+                    "nextRecordsUrl": "/services/data/v60.0/query/01g-2000",
+                    "records": [{"Id": "001000000000001"}, {"Id": "001000000000002"}],
+                }
+            ),
+            mock_http_response(
+                {"totalSize": 3, "done": True, "records": [{"Id": "001000000000003"}]}
+            ),
+        ]
+        mock_http_client.get = AsyncMock(side_effect=responses)
+        mock_http_client.request = AsyncMock(side_effect=responses)
+
+        query_result = await QueryAPI(client).soql("SELECT Id FROM Account")
+        records = await query_result.collect_all()
+
+        assert [r["Id"] for r in records] == [
+            "001000000000001",
+            "001000000000002",
+            "001000000000003",
+        ]
+        assert query_result.done
+
     @pytest.mark.asyncio
     async def test_sosl_search(self, mock_client, mock_http_response):
         """Test SOSL search execution."""
@@ -141,6 +197,25 @@ class TestQueryAPI:
         assert results[0]["Name"] == "Test Account"
         assert mock_http_client.get.called or mock_http_client.request.called
 
+    @pytest.mark.asyncio
+    async def test_soql_query_without_orjson(
+        self, mock_client, mock_http_response, monkeypatch
+    ):
+        """Test responses fall back to the standard json decoder without orjson."""
+        client, mock_http_client = mock_client
+        monkeypatch.setattr(_json, "orjson", None)
+
+        mock_response = mock_http_response(
+            {"totalSize": 1, "done": True, "records": [{"Id": "001000000000001"}]}
+        )
+        mock_response.content = b"not json"
+        mock_http_client.get = AsyncMock(return_value=mock_response)
+        mock_http_client.request = AsyncMock(return_value=mock_response)
+
+        query_result = await QueryAPI(client).soql("SELECT Id FROM Account")
+
+        assert await query_result.collect_all() == [{"Id": "001000000000001"}]
+
 
 class TestCollectionsAPI:
     """Test CollectionsAPI functionality."""
@@ -0,0 +1,1002 @@
+"""Unit tests for the exporter Arrow/Parquet conversion."""
+
+import asyncio
+import csv
+import datetime
+import gc
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+import boto3
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from botocore.exceptions import ClientError
+
+from aio_sf.exporter import (
+    ParquetWriter,
+    QueryResult,
+    export_sobjects_to_parquet,
+    query_result_to_batches,
+    S3MultipartSink,
+    create_s3_client,
+    get_bucket_region,
+    records_to_arrow_batch,
+    upload_file_to_s3,
+    write_query_to_parquet,
+    write_query_to_parquet_files,
+    write_query_to_s3,
+)
+from aio_sf.exporter.s3 import _default_s3_client
+from aio_sf.exporter.arrow import (
+    create_schema_from_metadata,
+    read_csv_page,
+    records_to_columns,
+)
+
+
+def to_csv(records):
+    """Render records the way the Bulk API does: fully quoted CSV with a header."""
+    if not records:
+        return ""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(records[0]), quoting=csv.QUOTE_ALL)
+    writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+def make_query_result(pages):
+    """Build a QueryResult whose job results are served from the given CSV pages."""
+    sf = MagicMock()
+    sf.version = "v60.0"
+    responses = [
+        (page, f"locator{i + 1}" if i < len(pages) - 1 else None)
+        for i, page in enumerate(pages)
+    ]
+    sf.bulk_v2.get_job_results = AsyncMock(side_effect=responses)
+    sf.bulk_v2.get_job_results_bytes = AsyncMock(
+        side_effect=[(page.encode("utf-8"), locator) for page, locator in responses]
+    )
+    return QueryResult(sf=sf, job_id="750000000000001")
+
+
+FIELDS_METADATA = [
+    {"name": "Id", "type": "id"},
+    {"name": "IsActive", "type": "boolean"},
+    {"name": "NumberOfEmployees", "type": "int"},
+    {"name": "AnnualRevenue", "type": "currency"},
+    {"name": "CreatedDate", "type": "datetime"},
+    {"name": "CloseDate", "type": "date"},
+]
+
+CSV_RECORDS = [
+    {
+        "Id": "001000000000001",
+        "IsActive": "true",
+        "NumberOfEmployees": "42",
+        "AnnualRevenue": "1000.5",
+        "CreatedDate": "2023-12-25T10:30:00.000+0000",
+        "CloseDate": "2025-10-01",
+    },
+    {
+        "Id": "001000000000002",
+        "IsActive": "false",
+        "NumberOfEmployees": "",
+        "AnnualRevenue": "",
+        "CreatedDate": "",
+        "CloseDate": "",
+    },
+]
+
+
+class TestRecordsToArrowBatch:
+    """Test conversion of Salesforce records into Arrow batches."""
+
+    def test_converts_bulk_csv_strings(self):
+        """Test CSV string values are parsed into the schema's types."""
+        schema = create_schema_from_metadata(
+            FIELDS_METADATA, column_formatter=str.lower
+        )
+
+        batch = records_to_arrow_batch(CSV_RECORDS, schema)
+
+        assert batch.schema == schema
+        rows = batch.to_pylist()
+        assert rows[0]["isactive"] is True
+        assert rows[0]["numberofemployees"] == 42
+        assert rows[0]["annualrevenue"] == 1000.5
+        assert rows[0]["createddate"] == datetime.datetime(
+            2023, 12, 25, 10, 30, tzinfo=datetime.timezone.utc
+        )
+        assert rows[0]["closedate"] == datetime.date(2025, 10, 1)
+        assert rows[1]["isactive"] is False
+        assert rows[1]["numberofemployees"] is None
+        assert rows[1]["createddate"] is None
+
+    def test_empty_strings_kept_when_not_converting(self):
+        """Test string columns keep empty strings if convert_empty_to_null is off."""
+        schema = pa.schema([pa.field("name", pa.string())])
+
+        batch = records_to_arrow_batch(
+            [{"Name": ""}, {"Name": "Acme"}], schema, convert_empty_to_null=False
+        )
+
+        assert batch.column(0).to_pylist() == ["", "Acme"]
+
+    def test_narrow_numeric_types(self):
+        """Test whole-number fields narrow by precision and fractional ones don't."""
+        fields = [
+            {"name": "Quantity", "type": "int", "digits": 9},
+            {"name": "BigCount", "type": "double", "precision": 18, "scale": 0},
+            {"name": "Amount", "type": "currency", "precision": 18, "scale": 2},
+            {"name": "Probability", "type": "percent", "precision": 3, "scale": 0},
+        ]
+        schema = create_schema_from_metadata(fields, narrow_numeric_types=True)
+        assert schema.types == [pa.int32(), pa.int64(), pa.float64(), pa.int32()]
+        assert create_schema_from_metadata(fields).types == [
+            pa.int64(),
+            pa.float64(),
+            pa.float64(),
+            pa.float64(),
+        ]
+
+        batch = records_to_arrow_batch(
+            [{"Quantity": "7", "BigCount": "5.0", "Amount": "1.5", "Probability": ""}],
+            create_schema_from_metadata(
+                fields, column_formatter=str.lower, narrow_numeric_types=True
+            ),
+        )
+        assert batch.to_pylist() == [
+            {"quantity": 7, "bigcount": 5, "amount": 1.5, "probability": None}
+        ]
+
+    def test_malformed_values_become_null(self):
+        """Test unparseable values are nulled instead of failing the batch."""
+        schema = pa.schema([pa.field("amount", pa.int64())])
+
+        batch = records_to_arrow_batch(
+            [{"Amount": "12"}, {"Amount": "not-a-number"}], schema
+        )
+
+        assert batch.column(0).to_pylist() == [12, None]
+
+    def test_fallback_keeps_decimal_whole_numbers_and_logs_losses(self, caplog):
+        """Test the per-value fallback retries via float64 and reports nulls."""
+        schema = pa.schema(
+            [pa.field("amount", pa.int64()), pa.field("quantity", pa.int32())]
+        )
+
+        batch = records_to_arrow_batch(
+            [
+                {"Amount": "5.0", "Quantity": "7"},
+                {"Amount": "bad", "Quantity": "3000000000"},
+            ],
+            schema,
+        )
+
+        assert batch.column(0).to_pylist() == [5, None]
+        assert batch.column(1).to_pylist() == [7, None]
+        messages = [r.getMessage() for r in caplog.records]
+        assert any("amount: 1 value(s)" in m and "'bad'" in m for m in messages)
+        assert any("quantity: 1 value(s)" in m and "int32" in m for m in messages)
+
+    def test_nested_values_stringified_for_string_columns(self):
+        """Test parent relationship dicts keep their text instead of becoming null."""
+        parent = {"attributes": {"type": "Account"}, "Name": "Acme"}
+        schema = pa.schema([pa.field("account", pa.string())])
+
+        batch = records_to_arrow_batch([{"Account": parent}, {"Account": None}], schema)
+
+        assert batch.column(0).to_pylist() == [str(parent), None]
+
+    def test_rest_records_skip_attributes(self):
+        """Test REST API attributes are dropped and missing keys become null."""
+        records = [
+            {"attributes": {"type": "Account"}, "Id": "001A", "Name": "Acme"},
+            {"attributes": {"type": "Account"}, "Id": "001B"},
+        ]
+
+        columns = records_to_columns(records, column_formatter=str.lower)
+
+        assert columns == {"id": ["001A", "001B"], "name": ["Acme", None]}
+
+    def test_uniform_records_pivot_in_field_order(self):
+        """Test records sharing the same fields pivot into lists in first-seen order."""
+        records = [
+            {"attributes": {"type": "Account"}, "Id": "001A", "Name": "Acme"},
+            {"Name": "Globex", "attributes": {"type": "Account"}, "Id": "001B"},
+        ]
+
+        columns = records_to_columns(records)
+
+        assert list(columns) == ["Id", "Name"]
+        assert columns == {"Id": ["001A", "001B"], "Name": ["Acme", "Globex"]}
+        assert all(isinstance(values, list) for values in columns.values())
+
+
+class TestCsvPages:
+    """Test the columnar Bulk API CSV path."""
+
+    def test_read_csv_page(self):
+        """Test a page is parsed into string columns, keeping empty values."""
+        columns = read_csv_page(to_csv(CSV_RECORDS), column_formatter=str.lower)
+
+        assert list(columns) == [f["name"].lower() for f in FIELDS_METADATA]
+        assert columns["numberofemployees"].to_pylist() == ["42", ""]
+
+    def test_read_csv_page_handles_embedded_newlines(self):
+        """Test quoted values containing newlines and quotes survive parsing."""
+        page = to_csv([{"Description": 'line one\nline "two"'}])
+
+        columns = read_csv_page(page)
+
+        assert columns["Description"].to_pylist() == ['line one\nline "two"']
+
+    def test_read_csv_page_from_bytes(self):
+        """Test raw UTF-8 response bytes parse the same as decoded text."""
+        page = to_csv([{"Name": "Café Ünïcode"}])
+
+        columns = read_csv_page(page.encode("utf-8"))
+
+        assert columns == read_csv_page(page)
+        assert columns["Name"].to_pylist() == ["Café Ünïcode"]
+
+    @pytest.mark.asyncio
+    async def test_query_result_to_batches(self):
+        """Test pages are streamed as typed batches no larger than batch_size."""
+        query_result = make_query_result([to_csv(CSV_RECORDS), to_csv(CSV_RECORDS[:1])])
+
+        batches = [
+            batch
+            async for batch in query_result_to_batches(
+                query_result, fields_metadata=FIELDS_METADATA, batch_size=1
+            )
+        ]
+
+        assert [b.num_rows for b in batches] == [1, 1, 1]
+        assert batches[0].schema.field("numberofemployees").type == pa.int64()
+        assert query_result._sf.bulk_v2.get_job_results_bytes.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_next_page_is_prefetched(self):
+        """Test the next page is requested while the current one is consumed."""
+        query_result = make_query_result([to_csv(CSV_RECORDS)] * 3)
+        get_job_results = query_result._sf.bulk_v2.get_job_results_bytes
+
+        pages = query_result.iter_csv_pages()
+        await pages.__anext__()
+        await asyncio.sleep(0)
+        assert get_job_results.await_count == 2
+        assert get_job_results.await_args.kwargs["locator"] == "locator1"
+
+        await pages.aclose()
+
+    @pytest.mark.asyncio
+    async def test_abandoned_prefetch_failure_is_retrieved(self):
+        """Test a failed prefetch is not reported as a never-retrieved exception."""
+        query_result = make_query_result([to_csv(CSV_RECORDS)] * 2)
+        get_job_results = query_result._sf.bulk_v2.get_job_results_bytes
+        get_job_results.side_effect = [
+            (to_csv(CSV_RECORDS).encode("utf-8"), "locator1"),
+            RuntimeError("page 2 failed"),
+        ]
+        unhandled = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+
+        pages = query_result.iter_csv_pages()
+        await pages.__anext__()
+        await asyncio.sleep(0)
+        await pages.aclose()
+        del pages
+        gc.collect()
+
+        loop.set_exception_handler(None)
+        assert get_job_results.await_count == 2
+        assert unhandled == []
+
+
+class TestQueryResultSyncIteration:
+    """Test iterating a bulk QueryResult from synchronous code."""
+
+    def test_sync_iteration_is_lazy(self):
+        """Test pages are fetched on demand rather than collected up front."""
+        query_result = make_query_result([to_csv(CSV_RECORDS), to_csv(CSV_RECORDS[:1])])
+        get_job_results = query_result._sf.bulk_v2.get_job_results
+
+        records = iter(query_result)
+        assert next(records)["Id"] == "001000000000001"
+        assert get_job_results.await_count == 1
+
+        assert len(list(records)) == 2
+        assert get_job_results.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_iteration_inside_event_loop_fails(self):
+        """Test sync iteration is refused while an event loop is running."""
+        query_result = make_query_result([to_csv(CSV_RECORDS)])
+
+        with pytest.raises(RuntimeError, match="async for"):
+            iter(query_result)
+
+
+class TestParquetWriter:
+    """Test ParquetWriter output."""
+
+    @pytest.mark.asyncio
+    async def test_write_query_result(self, tmp_path):
+        """Test records round-trip through a parquet file with typed columns."""
+        file_path = tmp_path / "accounts.parquet"
+        schema = create_schema_from_metadata(FIELDS_METADATA)
+
+        writer = ParquetWriter(str(file_path), schema=schema)
+        await writer.write_query_result(make_query_result([to_csv(CSV_RECORDS)]))
+
+        table = pq.read_table(file_path)
+        assert table.num_rows == 2
+        assert table.schema.field("NumberOfEmployees").type == pa.int64()
+        assert table.column("IsActive").to_pylist() == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_pages_are_combined_into_row_groups(self, tmp_path):
+        """Test row groups span pages and are capped at row_group_size."""
+        pages = [to_csv(CSV_RECORDS), to_csv(CSV_RECORDS), to_csv(CSV_RECORDS[:1])]
+
+        combined = tmp_path / "combined.parquet"
+        await ParquetWriter(str(combined)).write_query_result(make_query_result(pages))
+        capped = tmp_path / "capped.parquet"
+        await ParquetWriter(str(capped), row_group_size=2).write_query_result(
+            make_query_result(pages)
+        )
+
+        assert pq.ParquetFile(combined).num_row_groups == 1
+        capped_metadata = pq.ParquetFile(capped).metadata
+        assert [
+            capped_metadata.row_group(i).num_rows
+            for i in range(capped_metadata.num_row_groups)
+        ] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "compression, expected_level",
+        [("zstd", 3), ("gzip", None), ("snappy", None), ("none", None)],
+    )
+    async def test_compression(
+        self, tmp_path, monkeypatch, compression, expected_level
+    ):
+        """Test zstd defaults to level 3 and other codecs keep their own defaults."""
+        file_path = tmp_path / f"{compression}.parquet"
+        levels = []
+        parquet_writer = pq.ParquetWriter
+
+        def recording_parquet_writer(*args, **kwargs):
+            levels.append(kwargs["compression_level"])
+            return parquet_writer(*args, **kwargs)
+
+        monkeypatch.setattr(pq, "ParquetWriter", recording_parquet_writer)
+
+        kwargs = {} if compression == "zstd" else {"compression": compression}
+        writer = ParquetWriter(str(file_path), **kwargs)
+        await writer.write_query_result(make_query_result([to_csv(CSV_RECORDS)]))
+
+        column = pq.ParquetFile(file_path).metadata.row_group(0).column(0)
+        expected = "UNCOMPRESSED" if compression == "none" else compression.upper()
+        assert column.compression == expected
+        assert levels == [expected_level]
+
+    @pytest.mark.asyncio
+    async def test_dictionary_encodes_all_but_id(self, tmp_path):
+        """Test repeated values are dictionary-encoded while Id stays plain."""
+        file_path = tmp_path / "encoded.parquet"
+        records = [{"Id": f"00100000000000{i}", "Status": "Open"} for i in range(5)]
+
+        writer = ParquetWriter(str(file_path))
+        await writer.write_query_result(make_query_result([to_csv(records)]))
+
+        row_group = pq.ParquetFile(file_path).metadata.row_group(0)
+        assert "RLE_DICTIONARY" not in row_group.column(0).encodings
+        assert "RLE_DICTIONARY" in row_group.column(1).encodings
+        assert row_group.column(1).statistics.has_min_max
+
+    @pytest.mark.asyncio
+    async def test_infers_schema_without_metadata(self, tmp_path):
+        """Test the schema is inferred from the first batch when not provided."""
+        file_path = tmp_path / "inferred.parquet"
+
+        writer = ParquetWriter(str(file_path))
+        await writer.write_query_result(make_query_result([to_csv(CSV_RECORDS)]))
+
+        table = pq.read_table(file_path)
+        assert table.schema.names == [f["name"] for f in FIELDS_METADATA]
+        assert all(pa.types.is_string(t) for t in table.schema.types)
+
+    @pytest.mark.asyncio
+    async def test_writes_plain_record_iterators(self, tmp_path):
+        """Test sources without CSV pages (e.g. REST results) are still written."""
+        file_path = tmp_path / "rest.parquet"
+        records = [
+            {
+                "attributes": {"type": "Account"},
+                "Id": f"00100000000000{i}",
+                "IsActive": i % 2 == 0,
+                "NumberOfEmployees": i,
+            }
+            for i in range(5)
+        ]
+
+        async def rest_records():
+            for record in records:
+                yield record
+
+        schema = create_schema_from_metadata(FIELDS_METADATA[:3])
+        writer = ParquetWriter(str(file_path), schema=schema, batch_size=2)
+        await writer.write_query_result(rest_records())
+
+        table = pq.read_table(file_path)
+        assert table.schema.names == ["Id", "IsActive", "NumberOfEmployees"]
+        assert table.column("NumberOfEmployees").to_pylist() == [0, 1, 2, 3, 4]
+        assert table.column("IsActive").to_pylist() == [True, False, True, False, True]
+
+        batches = [
+            batch
+            async for batch in query_result_to_batches(
+                rest_records(), fields_metadata=FIELDS_METADATA, batch_size=2
+            )
+        ]
+        assert [b.num_rows for b in batches] == [2, 2, 1]
+        assert batches[0].schema.field("numberofemployees").type == pa.int64()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_warns_for_bulk_results(self, tmp_path, caplog):
+        """Test batch_size is reported as having no effect on Bulk QueryResults."""
+        file_path = tmp_path / "bulk.parquet"
+
+        await write_query_to_parquet(
+            make_query_result([to_csv(CSV_RECORDS)]), str(file_path)
+        )
+        assert not any("batch_size" in r.getMessage() for r in caplog.records)
+
+        await write_query_to_parquet(
+            make_query_result([to_csv(CSV_RECORDS)]), str(file_path), batch_size=1
+        )
+        assert any("batch_size has no effect" in r.getMessage() for r in caplog.records)
+        assert pq.read_table(file_path).num_rows == len(CSV_RECORDS)
+
+    @pytest.mark.asyncio
+    async def test_cancel_waits_for_page_write_before_close(self, tmp_path):
+        """Test cancellation lets the in-flight page write finish before closing."""
+        writer = ParquetWriter(str(tmp_path / "cancelled.parquet"))
+        events = []
+        started = threading.Event()
+        write_page, close = writer._write_page, writer.close
+
+        def slow_write_page(page):
+            started.set()
+            time.sleep(0.1)
+            write_page(page)
+            events.append("write")
+
+        def recording_close():
+            events.append("close")
+            close()
+
+        writer._write_page = slow_write_page
+        writer.close = recording_close
+        task = asyncio.ensure_future(
+            writer.write_query_result(make_query_result([to_csv(CSV_RECORDS)]))
+        )
+        await asyncio.to_thread(started.wait)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert events == ["write", "close"]
+
+
+class TestWriteQueryToParquetFiles:
+    """Test sharding a QueryResult across several parquet files."""
+
+    @pytest.mark.asyncio
+    async def test_pages_are_dealt_round_robin(self, tmp_path):
+        """Test each page goes to the next shard and empty shards are skipped."""
+        pages = [to_csv(CSV_RECORDS), to_csv(CSV_RECORDS[:1]), to_csv(CSV_RECORDS)]
+        file_paths = [str(tmp_path / f"part-{i:05d}.parquet") for i in range(4)]
+
+        files_created = await write_query_to_parquet_files(
+            make_query_result(pages), file_paths, fields_metadata=FIELDS_METADATA
+        )
+
+        assert files_created == 3
+        assert [pq.read_table(path).num_rows for path in file_paths[:3]] == [2, 1, 2]
+        assert not (tmp_path / "part-00003.parquet").exists()
+        dataset = pq.read_table(tmp_path)
+        assert dataset.num_rows == 5
+        assert dataset.schema.field("NumberOfEmployees").type == pa.int64()
+
+    @pytest.mark.asyncio
+    async def test_s3_sinks_are_finished_as_shards(self):
+        """Test S3MultipartSink shards are published, or aborted on failure."""
+        s3_client = make_s3_client()
+        sinks = [
+            S3MultipartSink("my-bucket", f"part-{i:05d}.parquet", s3_client=s3_client)
+            for i in range(2)
+        ]
+
+        files_created = await write_query_to_parquet_files(
+            make_query_result([to_csv(CSV_RECORDS)]),
+            sinks,
+            fields_metadata=FIELDS_METADATA,
+        )
+
+        assert files_created == 1
+        assert all(sink.closed for sink in sinks)
+        put = s3_client.put_object.call_args.kwargs
+        assert put["Key"] == "part-00000.parquet"
+        assert pq.read_table(pa.BufferReader(put["Body"])).num_rows == 2
+
+        failed_client = make_s3_client()
+        failed_sink = S3MultipartSink(
+            "my-bucket", "failed.parquet", s3_client=failed_client
+        )
+        query_result = MagicMock()
+
+        async def failing_pages():
+            yield to_csv(CSV_RECORDS).encode("utf-8")
+            raise RuntimeError("download failed")
+
+        query_result.iter_csv_pages = failing_pages
+
+        with pytest.raises(RuntimeError, match="download failed"):
+            await write_query_to_parquet_files(query_result, [failed_sink])
+
+        assert failed_sink.closed
+        assert not failed_client.put_object.called
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_file_paths(self):
+        """Test at least one output file is required."""
+        with pytest.raises(ValueError, match="file_paths"):
+            await write_query_to_parquet_files(make_query_result([""]), [])
+
+
+def make_export_client(records_by_sobject, fields=FIELDS_METADATA):
+    """Build a mock client that describes and bulk-queries the given SObjects."""
+    sf = MagicMock()
+    sf.version = "v60.0"
+    sf.describe.sobject = AsyncMock(
+        side_effect=lambda sobject_type, **kwargs: {
+            "name": sobject_type,
+            "fields": fields,
+        }
+    )
+    sf.bulk_v2.create_job = AsyncMock(
+        side_effect=lambda soql_query, **kwargs: {
+            "id": soql_query.split(" FROM ")[1].split()[0]
+        }
+    )
+    sf.bulk_v2.wait_for_job_completion = AsyncMock(
+        side_effect=lambda job_id, **kwargs: {
+            "numberRecordsProcessed": len(records_by_sobject[job_id])
+        }
+    )
+    sf.bulk_v2.get_job_results_bytes = AsyncMock(
+        side_effect=lambda job_id, **kwargs: (
+            to_csv(records_by_sobject[job_id]).encode("utf-8"),
+            None,
+        )
+    )
+    return sf
+
+
+class TestExportSObjects:
+    """Test exporting whole SObjects to parquet."""
+
+    @pytest.mark.asyncio
+    async def test_exports_each_sobject_to_its_own_file(self, tmp_path):
+        """Test each SObject is described, queried and written in input order."""
+        sf = make_export_client(
+            {"Account": CSV_RECORDS, "Opportunity": CSV_RECORDS[:1]}
+        )
+
+        results = await export_sobjects_to_parquet(
+            sf, ["Account", "Opportunity"], str(tmp_path), max_concurrent=2
+        )
+
+        assert [r["sobject_type"] for r in results] == ["Account", "Opportunity"]
+        assert [r["records_exported"] for r in results] == [2, 1]
+        assert pq.read_table(tmp_path / "Account.parquet").num_rows == 2
+        assert pq.read_table(tmp_path / "Opportunity.parquet").num_rows == 1
+        soql = sf.bulk_v2.create_job.await_args_list[0].kwargs["soql_query"]
+        assert soql.startswith("SELECT Id, IsActive, NumberOfEmployees")
+
+    @pytest.mark.asyncio
+    async def test_shards_sobject_into_part_files(self, tmp_path):
+        """Test files_per_sobject writes a directory of part files."""
+        sf = make_export_client({"Account": CSV_RECORDS})
+
+        results = await export_sobjects_to_parquet(
+            sf, ["Account"], str(tmp_path), files_per_sobject=4
+        )
+
+        assert results[0]["files_created"] == 1
+        assert results[0]["file_path"] == str(tmp_path / "Account")
+        assert pq.read_table(tmp_path / "Account" / "part-00000.parquet").num_rows == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_results_create_no_files(self, tmp_path):
+        """Test an SObject without records reports no files and leaves no directory."""
+        sf = make_export_client({"Account": [], "Contact": []})
+
+        single = await export_sobjects_to_parquet(sf, ["Account"], str(tmp_path))
+        sharded = await export_sobjects_to_parquet(
+            sf, ["Contact"], str(tmp_path / "sharded"), files_per_sobject=4
+        )
+
+        assert single[0]["files_created"] == 0
+        assert sharded[0]["files_created"] == 0
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_incremental_export_uses_watermark(self, tmp_path):
+        """Test modified_since filters the query and the latest modstamp is returned."""
+        fields = [
+            {"name": "Id", "type": "id"},
+            {"name": "SystemModstamp", "type": "datetime"},
+        ]
+        records = [
+            {"Id": "001000000000001", "SystemModstamp": "2025-01-02T03:04:05.678+0000"},
+            {"Id": "001000000000002", "SystemModstamp": "2025-01-01T00:00:00.000+0000"},
+        ]
+        sf = make_export_client({"Account": records}, fields=fields)
+
+        results = await export_sobjects_to_parquet(
+            sf,
+            ["Account"],
+            str(tmp_path),
+            modified_since={
+                "Account": datetime.datetime(2024, 12, 31, tzinfo=datetime.timezone.utc)
+            },
+        )
+
+        soql = sf.bulk_v2.create_job.await_args.kwargs["soql_query"]
+        assert soql.endswith("FROM Account WHERE SystemModstamp > 2024-12-31T00:00:00Z")
+        assert results[0]["watermark"] == "2025-01-02T03:04:05Z"
+
+    @pytest.mark.asyncio
+    async def test_modified_since_string_is_canonicalized(self, tmp_path):
+        """Test string watermarks are parsed and re-emitted as SOQL literals."""
+        fields = [
+            {"name": "Id", "type": "id"},
+            {"name": "SystemModstamp", "type": "datetime"},
+        ]
+        sf = make_export_client({"Account": []}, fields=fields)
+
+        results = await export_sobjects_to_parquet(
+            sf,
+            ["Account"],
+            str(tmp_path),
+            modified_since={"Account": "2025-01-01T02:00:00.000+0200"},
+        )
+
+        soql = sf.bulk_v2.create_job.await_args.kwargs["soql_query"]
+        assert soql.endswith("WHERE SystemModstamp > 2025-01-01T00:00:00Z")
+        assert results[0]["watermark"] == "2025-01-01T00:00:00Z"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "modified_since",
+        [
+            "2025-01-01T00:00:00Z OR Name != null",
+            "2025-01-01T00:00:00",
+            datetime.datetime(2025, 1, 1),
+        ],
+    )
+    async def test_rejects_invalid_modified_since(self, tmp_path, modified_since):
+        """Test malformed or timezone-less watermarks never reach the query."""
+        sf = make_export_client({"Account": CSV_RECORDS})
+
+        with pytest.raises(ValueError, match="modified_since"):
+            await export_sobjects_to_parquet(
+                sf,
+                ["Account"],
+                str(tmp_path),
+                modified_since={"Account": modified_since},
+            )
+
+        assert not sf.bulk_v2.create_job.called
+
+    @pytest.mark.asyncio
+    async def test_watermark_requires_systemmodstamp(self, tmp_path):
+        """Test incremental export is refused for SObjects without SystemModstamp."""
+        sf = make_export_client({"Account": CSV_RECORDS})
+
+        with pytest.raises(ValueError, match="SystemModstamp"):
+            await export_sobjects_to_parquet(
+                sf,
+                ["Account"],
+                str(tmp_path),
+                modified_since={"Account": "2025-01-01T00:00:00Z"},
+            )
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_concurrency(self, tmp_path):
+        """Test max_concurrent must be positive."""
+        with pytest.raises(ValueError, match="max_concurrent"):
+            await export_sobjects_to_parquet(
+                MagicMock(), ["Account"], str(tmp_path), max_concurrent=0
+            )
+
+
+class TestS3Upload:
+    """Test S3 upload helpers."""
+
+    @pytest.mark.asyncio
+    async def test_upload_file_uses_multipart_transfer(self, tmp_path):
+        """Test uploads go through upload_file with a multipart TransferConfig."""
+        file_path = tmp_path / "Account.parquet"
+        file_path.write_bytes(b"PAR1")
+        s3_client = MagicMock()
+
+        await upload_file_to_s3(
+            str(file_path),
+            "my-bucket",
+            "exports/Account.parquet",
+            s3_client=s3_client,
+            max_concurrency=16,
+        )
+
+        args = s3_client.upload_file.call_args
+        assert args.args == (str(file_path), "my-bucket", "exports/Account.parquet")
+        config = args.kwargs["Config"]
+        assert config.max_concurrency == 16
+        assert config.multipart_threshold == 8 * 1024 * 1024
+        assert config.multipart_chunksize == 16 * 1024 * 1024
+
+    def test_create_s3_client_sizes_connection_pool(self):
+        """Test clients get a larger pool, adaptive retries and keepalive."""
+        s3_client = create_s3_client(max_pool_connections=64)
+
+        config = s3_client.meta.config
+        assert config.max_pool_connections == 64
+        assert config.retries["mode"] == "adaptive"
+        assert config.tcp_keepalive is True
+
+    def test_create_s3_client_for_region(self):
+        """Test a region pins the client to the regional virtual-hosted endpoint."""
+        s3_client = create_s3_client(region_name="eu-west-1")
+
+        assert s3_client.meta.region_name == "eu-west-1"
+        assert s3_client.meta.config.s3 == {"addressing_style": "virtual"}
+
+    def test_default_client_built_once_across_threads(self, monkeypatch):
+        """Test concurrent workers share one client built from a dedicated session."""
+        monkeypatch.setattr("aio_sf.exporter.s3._default_clients", {})
+        sessions = []
+
+        def slow_create_s3_client(**kwargs):
+            sessions.append(kwargs["session"])
+            time.sleep(0.05)
+            return MagicMock()
+
+        monkeypatch.setattr(
+            "aio_sf.exporter.s3.create_s3_client", slow_create_s3_client
+        )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(
+                executor.map(lambda _: _default_s3_client(32, "eu-west-1"), range(8))
+            )
+
+        assert len(sessions) == 1
+        assert sessions[0] is not boto3.DEFAULT_SESSION
+        assert all(client is clients[0] for client in clients)
+
+    def test_bucket_region_is_looked_up_once(self, monkeypatch):
+        """Test the region comes from head_bucket and is cached per bucket."""
+        monkeypatch.setattr("aio_sf.exporter.s3._bucket_regions", {})
+        s3_client = MagicMock()
+        s3_client.head_bucket.return_value = {
+            "ResponseMetadata": {"HTTPHeaders": {"x-amz-bucket-region": "eu-west-1"}}
+        }
+
+        assert get_bucket_region("my-bucket", s3_client=s3_client) == "eu-west-1"
+        assert get_bucket_region("my-bucket", s3_client=s3_client) == "eu-west-1"
+        s3_client.head_bucket.assert_called_once_with(Bucket="my-bucket")
+
+    def test_bucket_region_read_from_error_response(self, monkeypatch):
+        """Test the region header is still used when head_bucket is denied."""
+        monkeypatch.setattr("aio_sf.exporter.s3._bucket_regions", {})
+        s3_client = MagicMock()
+        s3_client.head_bucket.side_effect = ClientError(
+            {
+                "Error": {"Code": "403", "Message": "Forbidden"},
+                "ResponseMetadata": {
+                    "HTTPHeaders": {"x-amz-bucket-region": "ap-southeast-2"}
+                },
+            },
+            "HeadBucket",
+        )
+
+        assert get_bucket_region("locked-bucket", s3_client=s3_client) == (
+            "ap-southeast-2"
+        )
+
+    def test_unresolved_bucket_region_is_retried(self, monkeypatch):
+        """Test a lookup without a region header is not cached."""
+        monkeypatch.setattr("aio_sf.exporter.s3._bucket_regions", {})
+        s3_client = MagicMock()
+        s3_client.head_bucket.side_effect = [
+            {"ResponseMetadata": {"HTTPHeaders": {}}},
+            {"ResponseMetadata": {"HTTPHeaders": {"x-amz-bucket-region": "us-west-2"}}},
+        ]
+
+        assert get_bucket_region("my-bucket", s3_client=s3_client) is None
+        assert get_bucket_region("my-bucket", s3_client=s3_client) == "us-west-2"
+        assert get_bucket_region("my-bucket", s3_client=s3_client) == "us-west-2"
+        assert s3_client.head_bucket.call_count == 2
+
+
+def make_s3_client():
+    """Build a mock boto3 S3 client that accepts multipart uploads."""
+    s3_client = MagicMock()
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    s3_client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": f"etag-{kwargs['PartNumber']}"
+    }
+    return s3_client
+
+
+class TestS3MultipartSink:
+    """Test streaming bytes to S3."""
+
+    MB = 1024 * 1024
+
+    def test_streams_full_parts_and_completes(self):
+        """Test full parts upload as they fill and the tail is sent on close."""
+        s3_client = make_s3_client()
+
+        with S3MultipartSink(
+            "my-bucket",
+            "exports/Account.parquet",
+            s3_client=s3_client,
+            part_size=5 * self.MB,
+        ) as sink:
+            sink.write(b"a" * (6 * self.MB))
+            assert s3_client.create_multipart_upload.called
+            sink.write(b"b" * (5 * self.MB))
+
+        bodies = [c.kwargs["Body"] for c in s3_client.upload_part.call_args_list]
+        assert [len(b) for b in bodies] == [5 * self.MB, 5 * self.MB, self.MB]
+        assert b"".join(bodies) == b"a" * (6 * self.MB) + b"b" * (5 * self.MB)
+        complete = s3_client.complete_multipart_upload.call_args.kwargs
+        assert complete["MultipartUpload"]["Parts"] == [
+            {"PartNumber": 1, "ETag": "etag-1"},
+            {"PartNumber": 2, "ETag": "etag-2"},
+            {"PartNumber": 3, "ETag": "etag-3"},
+        ]
+
+    def test_small_output_uses_single_put(self):
+        """Test output smaller than one part skips the multipart upload."""
+        s3_client = make_s3_client()
+
+        with S3MultipartSink("my-bucket", "small.parquet", s3_client=s3_client) as sink:
+            sink.write(b"PAR1")
+
+        s3_client.put_object.assert_called_once_with(
+            Bucket="my-bucket", Key="small.parquet", Body=b"PAR1"
+        )
+        assert not s3_client.create_multipart_upload.called
+
+    def test_error_aborts_upload(self):
+        """Test an exception inside the with block aborts the multipart upload."""
+        s3_client = make_s3_client()
+
+        with pytest.raises(RuntimeError):
+            with S3MultipartSink(
+                "my-bucket",
+                "failed.parquet",
+                s3_client=s3_client,
+                part_size=5 * self.MB,
+            ) as sink:
+                sink.write(b"a" * (5 * self.MB))
+                raise RuntimeError("export failed")
+
+        s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="my-bucket", Key="failed.parquet", UploadId="upload-1"
+        )
+        assert not s3_client.complete_multipart_upload.called
+
+    def test_unfinished_sink_is_never_published(self):
+        """Test closing or garbage collecting an unfinished sink publishes nothing."""
+        s3_client = make_s3_client()
+
+        sink = S3MultipartSink("my-bucket", "partial.parquet", s3_client=s3_client)
+        sink.write(b"partial")
+        del sink
+        gc.collect()
+
+        sink = S3MultipartSink(
+            "my-bucket", "partial.parquet", s3_client=s3_client, part_size=5 * self.MB
+        )
+        sink.write(b"a" * (6 * self.MB))
+        sink.close()
+
+        assert sink.closed
+        assert not s3_client.put_object.called
+        assert not s3_client.complete_multipart_upload.called
+        # close() makes no S3 requests; aborting is left to abort()
+        assert not s3_client.abort_multipart_upload.called
+
+    def test_rejects_parts_below_s3_minimum(self):
+        """Test part_size below 5 MB is rejected."""
+        with pytest.raises(ValueError, match="part_size"):
+            S3MultipartSink("my-bucket", "key", s3_client=MagicMock(), part_size=1024)
+
+    @pytest.mark.asyncio
+    async def test_write_query_to_s3(self):
+        """Test a QueryResult is written to S3 as a readable parquet object."""
+        s3_client = make_s3_client()
+
+        await write_query_to_s3(
+            make_query_result([to_csv(CSV_RECORDS)]),
+            "my-bucket",
+            "exports/Account.parquet",
+            s3_client=s3_client,
+            fields_metadata=FIELDS_METADATA,
+        )
+
+        body = s3_client.put_object.call_args.kwargs["Body"]
+        table = pq.read_table(pa.BufferReader(body))
+        assert table.num_rows == 2
+        assert table.column("NumberOfEmployees").to_pylist() == [42, None]
+
+    @pytest.mark.asyncio
+    async def test_default_client_resolved_off_event_loop(self, monkeypatch, tmp_path):
+        """Test the head_bucket-backed client lookup never runs on the event loop."""
+        s3_client = make_s3_client()
+        lookup_threads = []
+
+        def default_client_for(bucket, max_concurrency):
+            lookup_threads.append(threading.get_ident())
+            return s3_client
+
+        monkeypatch.setattr(
+            "aio_sf.exporter.s3._default_client_for", default_client_for
+        )
+        file_path = tmp_path / "Account.parquet"
+        file_path.write_bytes(b"PAR1")
+
+        await write_query_to_s3(
+            make_query_result([to_csv(CSV_RECORDS)]),
+            "my-bucket",
+            "exports/Account.parquet",
+            fields_metadata=FIELDS_METADATA,
+        )
+        await upload_file_to_s3(str(file_path), "my-bucket", "exports/Account.parquet")
+
+        assert len(lookup_threads) == 2
+        assert threading.get_ident() not in lookup_threads
+        assert s3_client.put_object.called
+
+    @pytest.mark.asyncio
+    async def test_write_query_to_s3_aborts_on_error(self):
+        """Test a failed export aborts the upload instead of publishing it."""
+        s3_client = make_s3_client()
+        query_result = MagicMock()
+
+        async def failing_pages():
+            yield to_csv(CSV_RECORDS).encode()
+            raise RuntimeError("download failed")
+
+        query_result.iter_csv_pages = failing_pages
+
+        with pytest.raises(RuntimeError, match="download failed"):
+            await write_query_to_s3(
+                query_result, "my-bucket", "failed.parquet", s3_client=s3_client
+            )
+
+        assert not s3_client.put_object.called